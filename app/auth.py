@@ -1,33 +1,53 @@
 import logging
 import secrets
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
 import bcrypt
 from fastapi import Cookie, Depends, HTTPException
 
+from .config import settings
 from .database import PgConnection, get_db
+from .session_cache import session_cache
+from .session_flusher import SessionExtender
 
 logger = logging.getLogger(__name__)
 
 SESSION_COOKIE = "session_token"
 SESSION_DAYS = 30
 RESET_TOKEN_HOURS = 1
+# Only re-extend a session once its expiry has slipped this far behind
+# "now + SESSION_DAYS"; saves a write for every request in between.
+SESSION_EXTEND_THRESHOLD = timedelta(hours=1)
+_EXTEND_WHEN_EXPIRES_WITHIN = timedelta(days=SESSION_DAYS) - SESSION_EXTEND_THRESHOLD
+# Entropy for session and reset tokens (256 bits)
+TOKEN_BYTES = 32
+
+session_extender = SessionExtender(days=SESSION_DAYS)
 
 
 def hash_password(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
+    """bcrypt-hash a password. CPU-bound (~250 ms at 12 rounds): only call
+    from plain `def` endpoints, which FastAPI runs in its worker threadpool,
+    never from an `async def` handler where it would stall the event loop."""
+    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    """Check a password against a bcrypt hash. Same threading caveat as hash_password."""
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
+def _new_token() -> str:
+    return secrets.token_urlsafe(TOKEN_BYTES)
+
+
 def create_session(db: PgConnection, employee_id: str) -> str:
-    token = secrets.token_urlsafe(32)
-    expires = datetime.now(timezone.utc) + timedelta(days=SESSION_DAYS)
-    db.execute(
-        "INSERT INTO sessions (token, employee_id, expires_at) VALUES (%s, %s, %s)",
-        (token, employee_id, expires.isoformat()),
+    token = _new_token()
+    db.execute_prepared(
+        "session_insert",
+        "INSERT INTO sessions (token, employee_id, expires_at) "
+        "VALUES (%s, %s, NOW() + make_interval(days => %s))",
+        (token, employee_id, SESSION_DAYS),
     )
     db.commit()
     return token
@@ -39,26 +59,35 @@ def get_current_employee(
 ) -> dict | None:
     if not session_token:
         return None
-    row = db.execute(
-        "SELECT e.id, e.first_name, e.last_name, e.email, e.avatar_url, e.is_active "
+    cached = session_cache.get(session_token)
+    if cached is not None and cached["is_active"]:
+        return cached
+    row = db.execute_prepared(
+        "session_lookup",
+        "SELECT e.id, e.first_name, e.last_name, e.email, e.avatar_url, e.is_active, "
+        "s.expires_at, s.expires_at < NOW() + %s::interval AS needs_extension "
         "FROM sessions s JOIN employees e ON s.employee_id = e.id "
         "WHERE s.token = %s AND s.expires_at > NOW() AND e.deleted_at IS NULL "
         "AND e.is_active = TRUE",
-        (session_token,),
+        (_EXTEND_WHEN_EXPIRES_WITHIN, session_token),
+        tuples=True,
     ).fetchone()
     if not row:
         return None
-    # Sliding expiry: best-effort, don't fail the request if this fails
-    try:
-        new_expires = datetime.now(timezone.utc) + timedelta(days=SESSION_DAYS)
-        db.execute(
-            "UPDATE sessions SET expires_at = %s WHERE token = %s",
-            (new_expires.isoformat(), session_token),
-        )
-        db.commit()
-    except Exception:
-        logger.warning("Failed to extend session expiry", exc_info=True)
-    return dict(row)
+    emp_id, first_name, last_name, email, avatar_url, is_active, expires_at, needs_extension = row
+    employee = {
+        "id": emp_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "avatar_url": avatar_url,
+        "is_active": is_active,
+    }
+    # Sliding expiry: queued and written in batches off the request path
+    if needs_extension:
+        session_extender.add(session_token)
+    session_cache.put(session_token, employee, expires_at)
+    return employee
 
 
 def require_auth(
@@ -70,11 +99,11 @@ def require_auth(
 
 
 def create_reset_token(db: PgConnection, employee_id: str) -> str:
-    token = secrets.token_urlsafe(32)
-    expires = datetime.now(timezone.utc) + timedelta(hours=RESET_TOKEN_HOURS)
+    token = _new_token()
     db.execute(
-        "INSERT INTO password_resets (token, employee_id, expires_at) VALUES (%s, %s, %s)",
-        (token, employee_id, expires.isoformat()),
+        "INSERT INTO password_resets (token, employee_id, expires_at) "
+        "VALUES (%s, %s, NOW() + make_interval(hours => %s))",
+        (token, employee_id, RESET_TOKEN_HOURS),
     )
     db.commit()
     return token
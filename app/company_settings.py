@@ -0,0 +1,18 @@
+from .read_cache import read_cache
+
+
+def get_settings(db, *keys: str) -> dict[str, str]:
+    """Read the given company settings in one query; unset keys are absent.
+
+    Cached in the "company" namespace next to GET /api/company, so
+    save_company/upload_logo invalidate it.
+    """
+    generation = read_cache.generation("company")
+    if (cached := read_cache.get("company", "settings", *keys)) is not None:
+        return cached
+    rows = db.execute(
+        "SELECT key, value FROM company_settings WHERE key = ANY(%s)", (list(keys),)
+    ).fetchall()
+    result = {r["key"]: r["value"] for r in rows}
+    read_cache.put("company", "settings", *keys, value=result, generation=generation)
+    return result
@@ -9,11 +9,18 @@ class Settings(BaseSettings):
     port: int = 3000
     upload_dir: str = os.path.join(os.path.dirname(__file__), "..", "uploads")
 
+    # bcrypt work factor for new password hashes (log2 iterations). The cost
+    # is stored in each hash, so changing it never breaks existing logins.
+    bcrypt_rounds: int = 12
+
     # Google API settings
     # Option 1: base64-encoded JSON (for production / env vars)
     google_service_account_json: str = ""
     # Option 2: path to JSON file (for local dev)
     google_service_account_path: str = ""
+    # Optional file to keep the current access token in across restarts
+    # (written 0600). Empty = always fetch a fresh token on startup.
+    google_token_cache_path: str = ""
     invoice_template_id: str = "16QHE3DdF0AAQtLgXUZSx8c9T2q3dvTvKwjb90B5yGcI"
     invoice_drive_folder_id: str = ""
 
@@ -1,9 +1,15 @@
 import json
 import os
+import re
+import threading
 
 import psycopg2
 import psycopg2.extras
-from collections.abc import Generator
+import psycopg2.pool
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+
+from fastapi import HTTPException
 
 from .config import settings
 
@@ -11,8 +17,25 @@ from .config import settings
 _CONNECTION_FILE = os.path.join(os.path.dirname(__file__), "..", "db", "connection.json")
 
 
+# Resolved URL, cached so the hot path doesn't re-read connection.json.
+# Only set_database_url / clear_database_url change it at runtime.
+_cached_url: str | None = None
+_url_lock = threading.Lock()
+
+
 def get_database_url() -> str:
     """Resolve the active database URL. Priority: connection.json > env var > default."""
+    global _cached_url
+    url = _cached_url
+    if url is not None:
+        return url
+    with _url_lock:
+        if _cached_url is None:
+            _cached_url = _read_database_url()
+        return _cached_url
+
+
+def _read_database_url() -> str:
     try:
         with open(_CONNECTION_FILE) as f:
             data = json.load(f)
@@ -28,6 +51,8 @@ def set_database_url(url: str):
     os.makedirs(os.path.dirname(_CONNECTION_FILE), exist_ok=True)
     with open(_CONNECTION_FILE, "w") as f:
         json.dump({"database_url": url}, f)
+    _invalidate_url()
+    _reset_pool()
 
 
 def clear_database_url():
@@ -36,6 +61,30 @@ def clear_database_url():
         os.remove(_CONNECTION_FILE)
     except FileNotFoundError:
         pass
+    _invalidate_url()
+    _reset_pool()
+
+
+def _invalidate_url():
+    global _cached_url
+    with _url_lock:
+        _cached_url = None
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has PREPAREd.
+
+    Prepared statements live for the lifetime of the server session, so
+    with pooled connections one PREPARE serves every later request that
+    leases the same connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+_PLACEHOLDER = re.compile(r"%s")
 
 
 class PgConnection:
@@ -50,6 +99,50 @@ class PgConnection:
         cur.execute(sql, params)
         return cur
 
+    def execute_tuple(self, sql: str, params=None):
+        """Like execute(), but rows come back as plain tuples instead of
+        RealDictRow, for hot queries where building dicts is wasted work."""
+        cur = self._conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        cur.execute(sql, params)
+        return cur
+
+    def execute_batch(self, sql: str, rows, page_size: int = 1000, fetch: bool = False):
+        """Insert/upsert many rows in one statement via execute_values.
+
+        `sql` must contain a single bare `%s` where the VALUES list goes,
+        e.g. "INSERT INTO t (a, b) VALUES %s". No-op for an empty `rows`.
+        With `fetch=True`, returns the rows produced by a RETURNING clause.
+        """
+        if not rows:
+            return []
+        with self._conn.cursor() as cur:
+            return psycopg2.extras.execute_values(cur, sql, rows, page_size=page_size, fetch=fetch)
+
+    def execute_prepared(self, name: str, sql: str, params=(), tuples: bool = False):
+        """Run `sql` as the server-side prepared statement `name`.
+
+        PREPAREs on first use per connection, then only sends EXECUTE, so
+        Postgres skips parse/plan. Use for a few fixed, very hot statements
+        (`%s` placeholders only, no literal `%`). Falls back to a plain
+        execute on connections that don't track prepared statements.
+        `tuples=True` returns tuple rows, as with execute_tuple().
+
+        Name columns explicitly rather than SELECT *: pooled connections keep
+        the statement for their whole life, and once a migration adds a
+        column, EXECUTE of a SELECT * statement fails with "cached plan must
+        not change result type".
+        """
+        prepared = getattr(self._conn, "prepared", None)
+        if prepared is None:
+            return self.execute_tuple(sql, params) if tuples else self.execute(sql, params)
+        cur = self._conn.cursor(cursor_factory=psycopg2.extensions.cursor) if tuples else self._conn.cursor()
+        if name not in prepared:
+            counter = iter(range(1, len(params) + 1))
+            cur.execute(f"PREPARE {name} AS " + _PLACEHOLDER.sub(lambda _: f"${next(counter)}", sql))
+            prepared.add(name)
+        cur.execute(f"EXECUTE {name} (" + ", ".join(["%s"] * len(params)) + ")", params)
+        return cur
+
     def commit(self):
         self._conn.commit()
 
@@ -63,14 +156,86 @@ class PgConnection:
         return self._conn.cursor()
 
 
+# Connection pool shared by all requests. ThreadedConnectionPool raises
+# instead of blocking when exhausted, and a lease lasts the whole request
+# (async and streaming routes included), so _pool_slots makes callers queue
+# for a free connection and only gives up after POOL_TIMEOUT seconds.
+POOL_MIN_CONN = 2
+POOL_MAX_CONN = 40
+POOL_TIMEOUT = 10  # seconds
+
+_pool: psycopg2.pool.ThreadedConnectionPool | None = None
+_pool_url: str | None = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_CONN)
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global _pool, _pool_url
+    url = get_database_url()
+    with _pool_lock:
+        if _pool is None or _pool_url != url:
+            # A retired pool is just dropped: connections still checked out
+            # go back to it and are closed when it is garbage-collected.
+            _pool = psycopg2.pool.ThreadedConnectionPool(
+                POOL_MIN_CONN, POOL_MAX_CONN, url,
+                connection_factory=_PooledConnection,
+                cursor_factory=psycopg2.extras.RealDictCursor,
+            )
+            _pool_url = url
+        return _pool
+
+
+def _reset_pool():
+    """Force the next get_db() to build a pool for the (possibly new) URL."""
+    global _pool, _pool_url
+    with _pool_lock:
+        _pool, _pool_url = None, None
+
+
+def _checkout() -> tuple[psycopg2.pool.ThreadedConnectionPool, psycopg2.extensions.connection]:
+    """Lease a connection, waiting up to POOL_TIMEOUT for one to free up.
+
+    Raises PoolError on timeout. Pair every call with _checkin().
+    """
+    if not _pool_slots.acquire(timeout=POOL_TIMEOUT):
+        raise psycopg2.pool.PoolError("timed out waiting for a database connection")
+    try:
+        pool = _get_pool()
+        return pool, pool.getconn()
+    except BaseException:
+        _pool_slots.release()
+        raise
+
+
+def _checkin(pool, conn):
+    try:
+        conn.rollback()
+    except psycopg2.Error:
+        # Broken connection (server restart, network drop): discard it
+        pool.putconn(conn, close=True)
+    else:
+        pool.putconn(conn, close=conn.closed != 0)
+    finally:
+        _pool_slots.release()
+
+
+@contextmanager
+def lease_connection() -> Iterator[psycopg2.extensions.connection]:
+    """Raw pooled connection for work outside a request (background writers)."""
+    pool, conn = _checkout()
+    try:
+        yield conn
+    finally:
+        _checkin(pool, conn)
+
+
 def get_db() -> Generator[PgConnection, None, None]:
-    conn = psycopg2.connect(
-        get_database_url(),
-        cursor_factory=psycopg2.extras.RealDictCursor,
-    )
-    db = PgConnection(conn)
     try:
-        yield db
+        pool, conn = _checkout()
+    except psycopg2.pool.PoolError:
+        raise HTTPException(status_code=503, detail="Database busy, try again")
+    try:
+        yield PgConnection(conn)
     finally:
-        db.rollback()
-        db.close()
+        _checkin(pool, conn)
@@ -1,5 +1,6 @@
 """Engineer data and standard rates for proposal generation."""
 
+import copy
 import json
 import os
 
@@ -33,7 +34,7 @@ RATES = {
 _TASKS_PATH = os.path.join(os.path.dirname(__file__), "..", "templates", "default_tasks.json")
 
 
-def load_default_tasks():
+def _read_default_tasks():
     with open(_TASKS_PATH) as f:
         tasks = json.load(f)
     # Ensure each task has an amount field
@@ -42,6 +43,15 @@ def load_default_tasks():
     return tasks
 
 
+# The template file doesn't change at runtime; parse it once at import.
+_DEFAULT_TASKS = _read_default_tasks()
+
+
+def load_default_tasks():
+    """Return a fresh copy of the default tasks (callers may mutate it)."""
+    return copy.deepcopy(_DEFAULT_TASKS)
+
+
 CHANGES_TASK = {
     "name": "Changes/On Call Coordination",
     "description": (
@@ -4,15 +4,22 @@ import base64
 import json
 import logging
 import os
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.generator import BytesGenerator
+from email.message import EmailMessage
+from email.policy import SMTP
 
 from io import BytesIO
 
 from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
 
 from .config import settings
@@ -27,23 +34,65 @@ SCOPES = [
 ]
 
 _credentials = None
+_cred_lock = threading.Lock()
+
+# Runs slow Google calls alongside independent work in the same request (PDF
+# export, signature metadata, Drive access checks). Service clients are
+# per-thread, so the workers never share an HTTP transport.
+GOOGLE_WORKERS = 8
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def google_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=GOOGLE_WORKERS, thread_name_prefix="google")
+        return _executor
+
+
+def shutdown_google_executor():
+    """Wait for in-flight Google calls and drop the executor (app shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 def _get_credentials():
-    global _credentials
-    if _credentials and _credentials.valid:
-        return _credentials
-    if _credentials and _credentials.expired:
-        _credentials.refresh(Request())
+    creds = _credentials
+    if creds is not None and not creds.expired:
+        # Steady state: valid, or not yet fetched a token (the first API
+        # call through an authorized transport does that)
+        return creds
+    with _cred_lock:
+        if _credentials is None:
+            _load_credentials()
+            if settings.google_token_cache_path and not _restore_token():
+                # Fetch now rather than inside the first API call so the new
+                # token gets written to the cache
+                _credentials.refresh(Request())
+                _save_token()
+        elif _credentials.expired:
+            _credentials.refresh(Request())
+            _save_token()
         return _credentials
 
+
+def _load_credentials():
+    """Build the service-account credentials once; caller holds _cred_lock."""
+    global _credentials
+
     # Option 1: base64-encoded JSON string (production)
     if settings.google_service_account_json:
         info = json.loads(base64.b64decode(settings.google_service_account_json))
         _credentials = service_account.Credentials.from_service_account_info(
             info, scopes=SCOPES
         )
-        return _credentials
+        return
 
     # Option 2: file path (local dev)
     path = settings.google_service_account_path
@@ -51,7 +100,7 @@ def _get_credentials():
         _credentials = service_account.Credentials.from_service_account_file(
             path, scopes=SCOPES
         )
-        return _credentials
+        return
 
     raise FileNotFoundError(
         "No Google credentials configured. Set CONDUCTOR_GOOGLE_SERVICE_ACCOUNT_JSON "
@@ -59,24 +108,128 @@ def _get_credentials():
     )
 
 
+def _restore_token() -> bool:
+    """Reuse a still-valid access token saved by a previous process, so a
+    restart skips the JWT signing and token exchange. Caller holds _cred_lock."""
+    path = settings.google_token_cache_path
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        if saved.get("account") != _credentials.service_account_email:
+            return False
+        _credentials.token = saved["token"]
+        _credentials.expiry = datetime.fromisoformat(saved["expiry"])
+    except (OSError, ValueError, KeyError):
+        logger.warning("Ignoring unreadable Google token cache %s", path, exc_info=True)
+        return False
+    return not _credentials.expired
+
+
+def _save_token():
+    """Write the current access token to the token cache file, if configured."""
+    path = settings.google_token_cache_path
+    if not path or not _credentials.token or _credentials.expiry is None:
+        return
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "account": _credentials.service_account_email,
+                "token": _credentials.token,
+                "expiry": _credentials.expiry.isoformat(),
+            }, f)
+    except OSError:
+        logger.warning("Could not write Google token cache %s", path, exc_info=True)
+
+
+# Built API clients, reused across calls. build() parses the discovery
+# document and generates the resource classes, which dominates the cost of
+# a small API call. The underlying httplib2 transport is not thread-safe and
+# sync routes run on a threadpool, so each thread keeps its own clients.
+# Token refreshes happen in place on the shared credentials object; a client
+# is only rebuilt when _get_credentials() hands back a different object.
+_services = threading.local()
+
+
+def _get_service(name: str, version: str):
+    creds = _get_credentials()
+    cache = getattr(_services, "cache", None)
+    if cache is None:
+        cache = _services.cache = {}
+    cached = cache.get((name, version))
+    if cached is not None and cached[0] is creds:
+        return cached[1]
+    service = build(name, version, credentials=creds, cache_discovery=False)
+    cache[(name, version)] = (creds, service)
+    return service
+
+
+def get_authorized_session() -> AuthorizedSession:
+    """Per-thread AuthorizedSession for raw HTTPS calls (e.g. PDF export).
+
+    Reusing the session keeps the TLS connection to docs.google.com alive
+    between exports instead of handshaking on every call.
+    """
+    creds = _get_credentials()
+    cached = getattr(_services, "session", None)
+    if cached is not None and cached[0] is creds:
+        return cached[1]
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    _services.session = (creds, session)
+    return session
+
+
 def get_drive_service():
-    return build("drive", "v3", credentials=_get_credentials(), cache_discovery=False)
+    return _get_service("drive", "v3")
 
 
 def get_sheets_service():
-    return build("sheets", "v4", credentials=_get_credentials(), cache_discovery=False)
+    return _get_service("sheets", "v4")
 
 
 def get_docs_service():
-    return build("docs", "v1", credentials=_get_credentials(), cache_discovery=False)
+    return _get_service("docs", "v1")
 
 
 def get_gmail_service():
-    return build("gmail", "v1", credentials=_get_credentials(), cache_discovery=False)
+    return _get_service("gmail", "v1")
+
+
+# (parent_id, name) -> (cached_at, folder ID). Project folders are never
+# renamed or moved by the app, so a resolved path can skip its files().list
+# calls for a while. Folders can still be trashed or deleted by hand in Drive:
+# entries expire after FOLDER_CACHE_TTL, and a 404 from a call into a cached
+# folder re-resolves the path (_in_project_folder).
+FOLDER_CACHE_TTL = 3600  # seconds
+FOLDER_CACHE_MAX = 1000
+
+_folder_ids: dict[tuple[str, str], tuple[float, str]] = {}
+
+
+def _remember_folder(parent_id: str, name: str, folder_id: str):
+    now = time.monotonic()
+    if len(_folder_ids) >= FOLDER_CACHE_MAX:
+        for key, (cached_at, _) in list(_folder_ids.items()):
+            if now - cached_at > FOLDER_CACHE_TTL:
+                _folder_ids.pop(key, None)
+        if len(_folder_ids) >= FOLDER_CACHE_MAX:
+            _folder_ids.clear()
+    _folder_ids[(parent_id, name)] = (now, folder_id)
+
 
+def _find_or_create_folder(drive, name: str, parent_id: str, refresh: bool = False) -> str:
+    """Find a subfolder by name under parent_id, or create it. Returns folder ID.
+
+    `refresh=True` ignores the cache and looks the folder up in Drive again.
+    """
+    cached = None if refresh else _folder_ids.get((parent_id, name))
+    if cached is not None and time.monotonic() - cached[0] <= FOLDER_CACHE_TTL:
+        return cached[1]
 
-def _find_or_create_folder(drive, name: str, parent_id: str) -> str:
-    """Find a subfolder by name under parent_id, or create it. Returns folder ID."""
     escaped_name = name.replace("\\", "\\\\").replace("'", "\\'")
     query = (
         f"name = '{escaped_name}' and mimeType = 'application/vnd.google-apps.folder' "
@@ -87,6 +240,7 @@ def _find_or_create_folder(drive, name: str, parent_id: str) -> str:
     ).execute()
     files = results.get("files", [])
     if files:
+        _remember_folder(parent_id, name, files[0]["id"])
         return files[0]["id"]
 
     metadata = {
@@ -96,10 +250,11 @@ def _find_or_create_folder(drive, name: str, parent_id: str) -> str:
     }
     folder = drive.files().create(body=metadata, fields="id", supportsAllDrives=True).execute()
     logger.info("Created Drive folder '%s' under %s -> %s", name, parent_id, folder["id"])
+    _remember_folder(parent_id, name, folder["id"])
     return folder["id"]
 
 
-def resolve_project_folder(drive, root_folder_id: str, data_path: str) -> str:
+def resolve_project_folder(drive, root_folder_id: str, data_path: str, refresh: bool = False) -> str:
     """Walk a slash-separated data_path (e.g. 'DR Horton/Silver Peaks') creating folders as needed.
     Returns the final folder ID."""
     if not data_path or not root_folder_id:
@@ -108,13 +263,96 @@ def resolve_project_folder(drive, root_folder_id: str, data_path: str) -> str:
     for part in data_path.strip("/").split("/"):
         part = part.strip()
         if part:
-            current = _find_or_create_folder(drive, part, current)
+            current = _find_or_create_folder(drive, part, current, refresh)
     return current
 
 
+def _in_project_folder(drive, root_folder_id: str, data_path: str, call):
+    """Run call(folder_id) with the resolved project folder (or root_folder_id
+    when there is no data_path). If Drive answers 404, a cached folder may
+    have been deleted since: re-resolve the path from Drive and retry once."""
+    if not data_path or not root_folder_id:
+        return call(root_folder_id)
+    try:
+        return call(resolve_project_folder(drive, root_folder_id, data_path))
+    except HttpError as e:
+        if e.resp.status != 404:
+            raise
+        return call(resolve_project_folder(drive, root_folder_id, data_path, refresh=True))
+
+
+_COL_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
 def _col_letter(col_index: int) -> str:
     """Convert 0-based column index to sheet letter (0=A, 1=B, ..., 25=Z)."""
-    return chr(ord("A") + col_index)
+    return _COL_LETTERS[col_index]
+
+
+# template_id -> (cached_at, layout of its first sheet). A Drive copy keeps the
+# sheet IDs, titles and cells, so the template's layout applies to every invoice.
+# Templates are edited by hand a few times a year; re-reading them every
+# ten minutes is plenty to pick up edits without a Drive call per invoice.
+TEMPLATE_CACHE_TTL = 600  # seconds
+
+_template_layouts: dict[str, tuple[float, dict]] = {}
+
+
+def _template_layout(sheets, template_id: str) -> dict:
+    """Return the first sheet's id/title, task marker row and token cells.
+
+    A copy starts out cell-for-cell identical to its template, so the layout
+    is read from the template once and reused for every invoice made from it.
+    """
+    cached = _template_layouts.get(template_id)
+    if cached is not None and time.monotonic() - cached[0] < TEMPLATE_CACHE_TTL:
+        return cached[1]
+
+    meta = sheets.spreadsheets().get(
+        spreadsheetId=template_id, fields="sheets.properties"
+    ).execute()
+    props = meta["sheets"][0]["properties"]
+    grid = sheets.spreadsheets().values().get(
+        spreadsheetId=template_id,
+        range=f"{props['title']}!A1:H50",
+        valueRenderOption="FORMATTED_VALUE",
+    ).execute().get("values", [])
+
+    marker_row = None
+    token_cells = []  # (row, col, text) for every cell holding a [bracket] token
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row):
+            cell_str = str(cell)
+            if marker_row is None and "{{task_name}}" in cell_str:
+                marker_row = r
+            if "[" in cell_str:
+                token_cells.append((r, c, cell_str))
+
+    layout = {
+        "sheet_id": props["sheetId"],
+        "sheet_title": props["title"],
+        "marker_row": marker_row,
+        "token_cells": token_cells,
+    }
+    _template_layouts[template_id] = (time.monotonic(), layout)
+    return layout
+
+
+def _left_align(sheet_id: int, row: int, col: int) -> dict:
+    """Build a repeatCell request left-aligning one cell (0-based row/col)."""
+    return {
+        "repeatCell": {
+            "range": {
+                "sheetId": sheet_id,
+                "startRowIndex": row,
+                "endRowIndex": row + 1,
+                "startColumnIndex": col,
+                "endColumnIndex": col + 1,
+            },
+            "cell": {"userEnteredFormat": {"horizontalAlignment": "LEFT"}},
+            "fields": "userEnteredFormat.horizontalAlignment",
+        }
+    }
 
 
 def update_invoice_date(spreadsheet_id: str, new_date: str) -> None:
@@ -123,8 +361,6 @@ def update_invoice_date(spreadsheet_id: str, new_date: str) -> None:
     Scans the header area (first 15 rows) for cells matching date patterns
     (YYYY-MM-DD or M/D/YYYY) and replaces them with the new date.
     """
-    import re
-
     sheets = get_sheets_service()
     sheet_meta = sheets.spreadsheets().get(
         spreadsheetId=spreadsheet_id, fields="sheets.properties"
@@ -189,76 +425,58 @@ def create_invoice_sheet(
     src_template = template_id or settings.invoice_template_id
     dest_folder = folder_id or settings.invoice_drive_folder_id
 
-    if project_data_path and dest_folder:
-        dest_folder = resolve_project_folder(drive, dest_folder, project_data_path)
-
-    copy_metadata = {"name": f"Invoice {invoice_number}"}
-    if dest_folder:
-        copy_metadata["parents"] = [dest_folder]
+    def copy_template(folder: str) -> dict:
+        copy_metadata = {"name": f"Invoice {invoice_number}"}
+        if folder:
+            copy_metadata["parents"] = [folder]
+        return drive.files().copy(
+            fileId=src_template,
+            body=copy_metadata,
+            supportsAllDrives=True,
+        ).execute()
 
-    copied = drive.files().copy(
-        fileId=src_template,
-        body=copy_metadata,
-        supportsAllDrives=True,
-    ).execute()
+    copied = _in_project_folder(drive, dest_folder, project_data_path, copy_template)
     spreadsheet_id = copied["id"]
 
-    # 2. Get sheet ID and read all cells
-    sheet_meta = sheets.spreadsheets().get(
-        spreadsheetId=spreadsheet_id, fields="sheets.properties"
-    ).execute()
-    sheet_id = sheet_meta["sheets"][0]["properties"]["sheetId"]
-    sheet_title = sheet_meta["sheets"][0]["properties"]["title"]
-
-    all_data = sheets.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range=f"{sheet_title}!A1:H50",
-        valueRenderOption="FORMATTED_VALUE",
-    ).execute()
-    grid = all_data.get("values", [])
-
-    # 3. Find the task marker row (contains {{task_name}})
-    marker_row = None
-    for r, row in enumerate(grid):
-        for cell in row:
-            if "{{task_name}}" in str(cell):
-                marker_row = r
-                break
-        if marker_row is not None:
-            break
-
-    # 4. Insert extra rows for tasks (duplicate marker row formatting)
+    # 2-3. Sheet ID/title, the task marker row (contains {{task_name}}) and
+    # the cells holding [bracket] tokens all come from the cached template layout
+    layout = _template_layout(sheets, src_template)
+    sheet_id = layout["sheet_id"]
+    sheet_title = layout["sheet_title"]
+    marker_row = layout["marker_row"]
+
+    # 4. Insert extra rows for tasks (duplicate marker row formatting). This is
+    # the first request of the structural batchUpdate sent in step 8, which
+    # runs before the value writes, so every cell below uses post-insertion
+    # row indexes.
     num_tasks = len(tasks) if tasks else 0
-    rows_to_insert = max(num_tasks - 1, 0)
-
-    if rows_to_insert > 0 and marker_row is not None:
-        sheets.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={"requests": [{
-                "insertDimension": {
-                    "range": {
-                        "sheetId": sheet_id,
-                        "dimension": "ROWS",
-                        "startIndex": marker_row + 1,
-                        "endIndex": marker_row + 1 + rows_to_insert,
-                    },
-                    "inheritFromBefore": True,
-                }
-            }]},
-        ).execute()
+    rows_to_insert = max(num_tasks - 1, 0) if marker_row is not None else 0
+    requests = []
+
+    if rows_to_insert > 0:
+        requests.append({
+            "insertDimension": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "dimension": "ROWS",
+                    "startIndex": marker_row + 1,
+                    "endIndex": marker_row + 1 + rows_to_insert,
+                },
+                "inheritFromBefore": True,
+            }
+        })
 
     # 5. Build token map for header and total replacements
     # Parse address into street + city/state/zip
-    addr_line1, addr_line2 = "", ""
-    if client_address:
-        parts = [l.strip() for l in client_address.replace("\r\n", "\n").split("\n") if l.strip()]
-        addr_line1 = parts[0] if len(parts) > 0 else ""
-        addr_line2 = parts[1] if len(parts) > 1 else ""
+    addr_lines = [l.strip() for l in (client_address or "").splitlines() if l.strip()]
+    addr_line1, addr_line2 = (addr_lines + ["", ""])[:2]
 
     # Compute totals from task data
-    total_fee = sum(float(t.get("unit_price", 0)) for t in tasks) if tasks else 0
-    total_previous = sum(float(t.get("previous_billing", 0)) for t in tasks) if tasks else 0
-    total_amount = sum(float(t.get("amount", 0)) for t in tasks) if tasks else 0
+    total_fee = total_previous = total_amount = 0
+    for t in tasks or ():
+        total_fee += float(t.get("unit_price", 0))
+        total_previous += float(t.get("previous_billing", 0))
+        total_amount += float(t.get("amount", 0))
 
     token_map = {
         "[ProjectName]": project_name,
@@ -278,20 +496,6 @@ def create_invoice_sheet(
         "[InvoiceTotal]": total_amount,
     }
 
-    # 6. Re-read the grid after row insertion
-    all_data = sheets.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range=f"{sheet_title}!A1:H{50 + rows_to_insert}",
-        valueRenderOption="FORMATTED_VALUE",
-    ).execute()
-    grid = all_data.get("values", [])
-
-    # Pad rows/cols so we can index safely
-    max_cols = 8  # A-H
-    for row in grid:
-        while len(row) < max_cols:
-            row.append("")
-
     # Tokens whose replacements are text (need left-align to prevent right-align)
     text_tokens = {
         "[ProjectName]", "[ProjectJobCode]", "[InvoiceDate]", "[InvoiceID]",
@@ -299,73 +503,65 @@ def create_invoice_sheet(
         "[Client Address]", "[City, State ZIP]", "[Client Project #]", "[Date]",
     }
 
-    # 7. Scan and replace all [bracket] tokens; track cells for left-alignment
-    updates = []  # list of {"range": "A1", "values": [[val]]}
-    header_token_cells = []  # (row, col) of text cells that need left-align
-
-    for r, row in enumerate(grid):
-        for c, cell in enumerate(row):
-            cell_str = str(cell)
-            new_val = cell_str
-            is_text_token = False
-
-            # Replace [bracket] tokens (may appear as substring, e.g. "Rendered Through: [Date]")
-            for token, value in token_map.items():
-                if token in new_val:
-                    new_val = new_val.replace(token, str(value))
-                    if token in text_tokens:
-                        is_text_token = True
-
-            if new_val != cell_str:
-                col_letter = _col_letter(c)
-                cell_ref = f"{col_letter}{r + 1}"
-                updates.append({"range": cell_ref, "values": [[new_val]]})
-                if is_text_token:
-                    header_token_cells.append((r, c))
+    # 7. Replace all [bracket] tokens; track cells for left-alignment (prevents
+    # date/number right-alignment). Inserted rows are blank, so cells below
+    # the marker just move down by rows_to_insert.
+    # Tokens may appear as a substring, e.g. "Rendered Through: [Date]"; one
+    # alternation pattern replaces every token in a cell in a single pass.
+    token_pattern = re.compile("|".join(map(re.escape, token_map)))
+    updates = []  # list of {"range": "Sheet1!A1", "values": [[val]]}
+
+    for r, c, cell_str in layout["token_cells"]:
+        sheet_row = r + rows_to_insert if marker_row is not None and r > marker_row else r
+        matched = set()
+
+        def replace(m):
+            matched.add(m.group(0))
+            return str(token_map[m.group(0)])
+
+        new_val = token_pattern.sub(replace, cell_str)
+        is_text_token = not matched.isdisjoint(text_tokens)
+
+        if new_val != cell_str:
+            updates.append({
+                "range": f"{sheet_title}!{_col_letter(c)}{sheet_row + 1}",
+                "values": [[new_val]],
+            })
+            if is_text_token:
+                requests.append(_left_align(sheet_id, sheet_row, c))
 
     # 7b. Write task rows directly (inserted rows are blank — write positionally)
     if marker_row is not None and num_tasks > 0:
         for i, task in enumerate(tasks):
             row_num = marker_row + i + 1  # 1-based sheet row
-            percent_val = task.get("quantity", 0)
             # Round to avoid float artifacts (e.g. 59.99999 → 60), format as "60%"
-            pct_display = f"{round(percent_val)}%"
-            updates.append({"range": f"A{row_num}", "values": [[task.get("name", "")]]})
-            updates.append({"range": f"C{row_num}", "values": [[task.get("unit_price", 0)]]})
-            updates.append({"range": f"D{row_num}", "values": [[pct_display]]})
-            updates.append({"range": f"E{row_num}", "values": [[task.get("previous_billing", 0)]]})
-            updates.append({"range": f"F{row_num}", "values": [[task.get("amount", 0)]]})
-        # Clear the original marker row token text if no tasks replaced it
-        # (handled above since task 0 writes to marker_row)
-
-    # 8. Write all replacements
+            pct_display = f"{round(task.get('quantity', 0))}%"
+            updates.extend(
+                {"range": f"{sheet_title}!{col}{row_num}", "values": [[value]]}
+                for col, value in (
+                    ("A", task.get("name", "")),
+                    ("C", task.get("unit_price", 0)),
+                    ("D", pct_display),
+                    ("E", task.get("previous_billing", 0)),
+                    ("F", task.get("amount", 0)),
+                )
+            )
+
+    # 8. Insert rows and set alignment in one batchUpdate, then write every
+    # value in one values.batchUpdate. USER_ENTERED parses the values the way
+    # typing them would, so dates stay dates and "60%" stays a percentage.
+    if requests:
+        sheets.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={"requests": requests},
+        ).execute()
+
     if updates:
         sheets.spreadsheets().values().batchUpdate(
             spreadsheetId=spreadsheet_id,
             body={"valueInputOption": "USER_ENTERED", "data": updates},
         ).execute()
 
-    # 9. Left-align cells that had header tokens (prevent date/number right-alignment)
-    if header_token_cells:
-        align_requests = []
-        for row_idx, col_idx in header_token_cells:
-            align_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": sheet_id,
-                        "startRowIndex": row_idx,
-                        "endRowIndex": row_idx + 1,
-                        "startColumnIndex": col_idx,
-                        "endColumnIndex": col_idx + 1,
-                    },
-                    "cell": {"userEnteredFormat": {"horizontalAlignment": "LEFT"}},
-                    "fields": "userEnteredFormat.horizontalAlignment",
-                }
-            })
-        sheets.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={"requests": align_requests},
-        ).execute()
 
     sheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
     logger.info("Created invoice sheet %s: %s", invoice_number, sheet_url)
@@ -414,8 +610,7 @@ def read_invoice_sheet(spreadsheet_id: str) -> list[dict]:
 
 def export_sheet_as_pdf(spreadsheet_id: str) -> bytes:
     """Export a Google Sheet as PDF bytes (gridlines hidden)."""
-    creds = _get_credentials()
-    session = AuthorizedSession(creds)
+    session = get_authorized_session()
     url = (
         f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export"
         f"?format=pdf&gridlines=false"
@@ -431,20 +626,19 @@ def upload_pdf_to_drive(pdf_bytes: bytes, filename: str, folder_id: str = "", pr
     drive = get_drive_service()
     dest_folder = folder_id or settings.invoice_drive_folder_id
 
-    if project_data_path and dest_folder:
-        dest_folder = resolve_project_folder(drive, dest_folder, project_data_path)
-
-    file_metadata = {"name": filename, "mimeType": "application/pdf"}
-    if dest_folder:
-        file_metadata["parents"] = [dest_folder]
+    def upload(folder: str) -> dict:
+        file_metadata = {"name": filename, "mimeType": "application/pdf"}
+        if folder:
+            file_metadata["parents"] = [folder]
+        media = MediaIoBaseUpload(BytesIO(pdf_bytes), mimetype="application/pdf")
+        return drive.files().create(
+            body=file_metadata,
+            media_body=media,
+            fields="id, webViewLink",
+            supportsAllDrives=True,
+        ).execute()
 
-    media = MediaIoBaseUpload(BytesIO(pdf_bytes), mimetype="application/pdf")
-    uploaded = drive.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields="id, webViewLink",
-        supportsAllDrives=True,
-    ).execute()
+    uploaded = _in_project_folder(drive, dest_folder, project_data_path, upload)
 
     return uploaded.get("webViewLink", f"https://drive.google.com/file/d/{uploaded['id']}/view")
 
@@ -464,24 +658,27 @@ def send_invoice_email(
     """
     gmail = get_gmail_service()
 
-    msg = MIMEMultipart()
+    msg = EmailMessage()
     msg["To"] = ", ".join(to_emails)
     msg["Subject"] = subject
     if from_email:
         msg["From"] = from_email
 
-    msg.attach(MIMEText(body_text, "plain"))
-
-    attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
-    attachment.add_header("Content-Disposition", "attachment", filename=pdf_filename)
-    msg.attach(attachment)
+    msg.set_content(body_text)
+    msg.add_attachment(pdf_bytes, maintype="application", subtype="pdf", filename=pdf_filename)
 
-    raw = base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
+    # Upload the RFC 822 message as media rather than a base64 "raw" field:
+    # the generator writes straight into one buffer and the attachment is
+    # never held as an extra encoded copy.
+    buf = BytesIO()
+    BytesGenerator(buf, mangle_from_=False, policy=SMTP).flatten(msg)
+    buf.seek(0)
 
     user_id = from_email or "me"
     result = gmail.users().messages().send(
         userId=user_id,
-        body={"raw": raw},
+        body={},
+        media_body=MediaIoBaseUpload(buf, mimetype="message/rfc822"),
     ).execute()
 
     logger.info("Sent invoice email to %s, message ID: %s", to_emails, result.get("id"))
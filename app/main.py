@@ -1,25 +1,53 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 import traceback
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from .auth import session_extender
+from .google_sheets import shutdown_google_executor
 from .routers import activity_log, auth, clients, company, contacts, contracts, deliverables, employees, flows, invoices, projects, proposals, raindrop_analytics, tasks, time_entries, uploads, updates, wiki
 
 _log_file = Path(__file__).resolve().parent.parent / "conductor.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(message)s",
-    datefmt="%H:%M:%S",
-    handlers=[logging.StreamHandler(), logging.FileHandler(_log_file)],
-)
+_log_formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S")
+_log_handlers = [logging.StreamHandler(), logging.FileHandler(_log_file)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+# Request threads only enqueue records; the listener thread does the console
+# and file writes, so a slow disk never holds up request handling.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
 logger = logging.getLogger("conductor")
 
-app = FastAPI(title="Conductor API", version="1.0.0")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    session_extender.start()
+    company.init_company_schema()
+    yield
+    session_extender.stop()
+    shutdown_google_executor()
+
+
+app = FastAPI(
+    title="Conductor API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 
 @app.exception_handler(HTTPException)
@@ -42,22 +70,38 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
+LOG_BODY_MAX_BYTES = 64 * 1024
+
+
+def _should_log_body(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(("multipart/", "application/octet-stream")):
+        return False
+    length = request.headers.get("content-length")
+    return length is not None and length.isdigit() and int(length) <= LOG_BODY_MAX_BYTES
+
+
 @app.middleware("http")
 async def log_api_requests(request: Request, call_next):
     if not request.url.path.startswith("/api/"):
         return await call_next(request)
 
+    # Only small JSON/form bodies are worth logging; uploads would be buffered
+    # in full just to print a 500-byte prefix.
     body = b""
-    if request.method in ("POST", "PATCH", "PUT"):
+    if request.method in ("POST", "PATCH", "PUT") and _should_log_body(request):
         body = await request.body()
 
-    start = time.time()
+    start = time.perf_counter_ns()
     response = await call_next(request)
-    ms = (time.time() - start) * 1000
+    ms = round((time.perf_counter_ns() - start) / 1e6)
 
-    msg = f"{request.method} {request.url.path} -> {response.status_code} ({ms:.0f}ms)"
+    msg = f"{request.method} {request.url.path} -> {response.status_code} ({ms}ms)"
     if body:
         msg += f" body={body[:500].decode(errors='replace')}"
+    elif request.headers.get("content-length", "0") not in ("", "0"):
+        # Body not logged (upload, or too large); note its size instead
+        msg += f" body=<{request.headers['content-length']} bytes>"
     if response.status_code >= 400:
         logger.warning(msg)
     else:
@@ -86,12 +130,24 @@ app.include_router(raindrop_analytics.router, prefix="/api/raindrop", tags=["rai
 app.include_router(wiki.router, prefix="/api/wiki", tags=["wiki"])
 
 # --- Static files (Vue SPA) ---
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for Vite's content-hashed bundles. A changed file gets a
+    new name, so browsers may cache every response forever and never
+    revalidate (no per-load conditional requests to the API process)."""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 static_root = Path(__file__).resolve().parent.parent
 vue_dist = static_root / "frontend" / "dist"
 
 app.mount("/uploads", StaticFiles(directory=static_root / "uploads"), name="uploads")
 app.mount("/flows", StaticFiles(directory=static_root / "flows", html=True), name="flows")
-app.mount("/assets", StaticFiles(directory=vue_dist / "assets"), name="vue-assets")
+app.mount("/assets", ImmutableStaticFiles(directory=vue_dist / "assets"), name="vue-assets")
 
 
 @app.get("/{path:path}")
@@ -26,8 +26,8 @@ class ClientResponse(BaseModel):
     phone: str | None = None
     address: str | None = None
     notes: str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
 
 class ClientNoteCreate(BaseModel):
@@ -42,4 +42,4 @@ class ClientNoteResponse(BaseModel):
     author_name: str | None = None
     author_avatar_url: str | None = None
     content: str
-    created_at: datetime | str | None = None
+    created_at: datetime | None = None
@@ -29,8 +29,8 @@ class ContactResponse(BaseModel):
     role: str | None = None
     notes: str | None = None
     client_id: str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
 
 class ContactNoteCreate(BaseModel):
@@ -45,4 +45,4 @@ class ContactNoteResponse(BaseModel):
     author_name: str | None = None
     author_avatar_url: str | None = None
     content: str
-    created_at: datetime | str | None = None
+    created_at: datetime | None = None
@@ -34,5 +34,5 @@ class DeliverableResponse(BaseModel):
     sent_at: datetime | str | None = None
     updated_by: str | None = None
     updated_by_name: str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
@@ -27,5 +27,5 @@ class EmployeeResponse(BaseModel):
     bot_id: str | None = None
     avatar_url: str | None = None
     is_active: bool = True
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
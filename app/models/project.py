@@ -77,7 +77,7 @@ class ProjectNoteResponse(BaseModel):
     author_name: str | None = None
     author_avatar_url: str | None = None
     content: str
-    created_at: datetime | str | None = None
+    created_at: datetime | None = None
 
 
 class ProjectDetail(ProjectSummary):
@@ -85,8 +85,8 @@ class ProjectDetail(ProjectSummary):
     notes: str | None = None
     client_phone: str | None = None
     current_invoice_id: str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
     contracts: list[dict] = []
     invoices: list[dict] = []
     proposals: list[dict] = []
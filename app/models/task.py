@@ -18,7 +18,7 @@ class TaskNoteResponse(BaseModel):
     author_id: str | None = None
     author_name: str | None = None
     content: str
-    created_at: datetime | str | None = None
+    created_at: datetime | None = None
 
 
 class TaskCreate(BaseModel):
@@ -66,8 +66,8 @@ class TaskResponse(BaseModel):
     sort_order: int = 0
     created_by: str | None = None
     completed_at: datetime | str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
     is_stale: bool = False
     is_pinned: bool = False
     tags: list[str] = []
@@ -26,5 +26,5 @@ class WikiNoteResponse(BaseModel):
     updated_by: str | None = None
     created_by_name: str | None = None
     updated_by_name: str | None = None
-    created_at: datetime | str | None = None
-    updated_at: datetime | str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
@@ -0,0 +1,44 @@
+"""Opt-in keyset pagination for list endpoints.
+
+Without ?limit an endpoint returns every row, as it always has. With it, the
+endpoint returns at most `limit` rows and, when more remain, sets the
+X-Next-Cursor header; pass that value back as ?after= to get the next page.
+Cursors encode the sort key of the last row, so each page is an index range
+scan rather than an OFFSET that reads and discards the earlier pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int = 2) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def paginate(response: Response, rows: list, limit: int | None, key) -> list:
+    """Trim rows fetched with LIMIT limit + 1 to one page and set the cursor.
+
+    `key` maps the last row of the page to the values its cursor encodes.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -2,15 +2,31 @@
 
 import logging
 import re
-
-from google.auth.transport.requests import AuthorizedSession
+from collections.abc import Iterator
 
 from .config import settings
 from .engineers import ENGINEERS, RATES
-from .google_sheets import get_drive_service, get_docs_service, _get_credentials
+from .google_sheets import get_authorized_session, get_docs_service, get_drive_service, google_executor
 
 logger = logging.getLogger(__name__)
 
+_FIRST_WORD = re.compile(r"\S+")
+
+# Placeholder values that never change between proposals, built once
+_ENGINEER_REPLACEMENTS = {
+    key: {
+        "{engineer_name}": engineer["name"],
+        "{engineer_title}": engineer["title"],
+        "{engineer_phone}": engineer.get("phone", ""),
+    }
+    for key, engineer in ENGINEERS.items()
+}
+_RATE_REPLACEMENTS = {
+    "{pe_rate}": str(RATES["pe"]["rate"]),
+    "{tech_rate}": str(RATES["technician"]["rate"]),
+    "{designer_rate}": str(RATES["designer"]["rate"]),
+}
+
 
 def generate_proposal_doc(
     *,
@@ -45,6 +61,12 @@ def generate_proposal_doc(
     src_template = template_id or settings.proposal_template_id
     dest_folder = folder_id or settings.proposal_drive_folder_id
 
+    # The signature's aspect ratio only depends on the image file, so fetch it
+    # on a worker thread while the template is copied and filled in.
+    engineer = ENGINEERS.get(engineer_key, ENGINEERS["tim"])
+    sig_file_id = engineer.get("signature_file_id")
+    sig_aspect = google_executor().submit(_signature_aspect, sig_file_id) if sig_file_id else None
+
     # 1. Copy the template
     doc_name = f"{project_name} Irrigation Design Proposal"
     copy_metadata = {"name": doc_name}
@@ -59,34 +81,25 @@ def generate_proposal_doc(
     doc_id = copied["id"]
 
     # 2. Build replacement map
-    engineer = ENGINEERS.get(engineer_key, ENGINEERS["tim"])
+    first_word = _FIRST_WORD.search(client_name)
+    client_first = first_word.group(0) if first_word else client_name
 
-    name_parts = client_name.strip().split(None, 1)
-    client_first = name_parts[0] if name_parts else client_name
-
-    # City/state/zip line
-    city_state_zip_parts = []
-    if client_city:
-        city_state_zip_parts.append(client_city)
-    if client_state:
-        if city_state_zip_parts:
-            city_state_zip_parts[-1] += ","
-        city_state_zip_parts.append(client_state)
-    if client_zip:
-        city_state_zip_parts.append(client_zip)
-    city_state_zip = " ".join(city_state_zip_parts)
-
-    # Task sections text (for Exhibit A scope)
+    # City/state/zip line, e.g. "Boise, ID 83702"
+    city = f"{client_city}," if client_city and client_state else client_city
+    city_state_zip = " ".join(part for part in (city, client_state, client_zip) if part)
+
+    # Task sections text (for Exhibit A scope) and the fee total, in one pass
     task_sections_parts = []
+    total_fee = 0
     for i, task in enumerate(tasks, 1):
-        section = f"Task {i}: {task['name']}"
-        if task.get("description"):
-            section += f"\n{task['description']}"
-        task_sections_parts.append(section)
+        description = task.get("description")
+        if description:
+            task_sections_parts.append(f"Task {i}: {task['name']}\n{description}")
+        else:
+            task_sections_parts.append(f"Task {i}: {task['name']}")
+        total_fee += task["amount"]
     task_sections = "\n\n".join(task_sections_parts)
 
-    total_fee = sum(t["amount"] for t in tasks)
-
     # Additional exclusions
     excl_text = ""
     if additional_exclusions:
@@ -100,16 +113,12 @@ def generate_proposal_doc(
         "{client_company}": client_company or "",
         "{client_address}": client_address or "",
         "{client_city_state_zip}": city_state_zip,
-        "{engineer_name}": engineer["name"],
-        "{engineer_title}": engineer["title"],
-        "{engineer_phone}": engineer.get("phone", ""),
+        **_ENGINEER_REPLACEMENTS.get(engineer_key, _ENGINEER_REPLACEMENTS["tim"]),
         "{contact_method}": contact_method or "conversation",
         "{task_sections}": task_sections,
         "{fee_table_rows}": "",
         "{total_fee}": f"${total_fee:,.0f}",
-        "{pe_rate}": str(RATES["pe"]["rate"]),
-        "{tech_rate}": str(RATES["technician"]["rate"]),
-        "{designer_rate}": str(RATES["designer"]["rate"]),
+        **_RATE_REPLACEMENTS,
         "{additional_exclusions}": excl_text,
     }
 
@@ -138,9 +147,10 @@ def generate_proposal_doc(
     _populate_fee_table(docs, doc_id, tasks)
 
     # 6. Replace signature placeholder image
-    sig_file_id = engineer.get("signature_file_id")
-    if sig_file_id:
-        _replace_signature_image(docs, drive, doc_id, sig_file_id)
+    if sig_aspect is not None:
+        aspect = sig_aspect.result()
+        if aspect:
+            _replace_signature_image(docs, doc_id, sig_file_id, aspect)
 
     doc_url = f"https://docs.google.com/document/d/{doc_id}/edit"
     logger.info("Created proposal doc '%s': %s", doc_name, doc_url)
@@ -414,7 +424,27 @@ def _populate_fee_table(docs_service, doc_id: str, tasks: list[dict]):
     logger.info("Populated fee table with %d task rows in doc %s", len(tasks), doc_id)
 
 
-def _replace_signature_image(docs_service, drive_service, doc_id: str, signature_file_id: str):
+def _signature_aspect(signature_file_id: str) -> float | None:
+    """Width/height of the signature image, or None if it can't be read.
+
+    Runs on a worker thread, so it uses that thread's own Drive client.
+    """
+    try:
+        img_meta = get_drive_service().files().get(
+            fileId=signature_file_id, fields="imageMediaMetadata", supportsAllDrives=True,
+        ).execute()
+        im = img_meta.get("imageMediaMetadata", {})
+        height = im.get("height", 0)
+        if not height:
+            logger.warning("Signature image %s has zero height; skipping", signature_file_id)
+            return None
+        return im.get("width", 1) / height
+    except Exception as e:
+        logger.warning("Could not read signature image metadata for %s: %s", signature_file_id, e)
+        return None
+
+
+def _replace_signature_image(docs_service, doc_id: str, signature_file_id: str, aspect: float):
     """Find the placeholder signature image, delete it, and insert the real one at correct size."""
     doc = docs_service.documents().get(documentId=doc_id).execute()
     inline_objects = doc.get("inlineObjects", {})
@@ -465,21 +495,6 @@ def _replace_signature_image(docs_service, drive_service, doc_id: str, signature
     placeholder = inline_objects[target_id]["inlineObjectProperties"]["embeddedObject"]
     ph_height = placeholder.get("size", {}).get("height", {}).get("magnitude", 25)
 
-    # Get signature aspect ratio to calculate width
-    try:
-        img_meta = drive_service.files().get(
-            fileId=signature_file_id, fields="imageMediaMetadata", supportsAllDrives=True,
-        ).execute()
-        im = img_meta.get("imageMediaMetadata", {})
-        height = im.get("height", 0)
-        if not height:
-            logger.warning("Signature image %s has zero height; skipping", signature_file_id)
-            return
-        aspect = im.get("width", 1) / height
-    except Exception as e:
-        logger.warning("Could not read signature image metadata for %s: %s", signature_file_id, e)
-        return
-
     new_width = ph_height * aspect
     sig_uri = f"https://drive.google.com/uc?id={signature_file_id}&export=download"
 
@@ -505,14 +520,40 @@ def _replace_signature_image(docs_service, drive_service, doc_id: str, signature
 
 
 
-def export_google_doc_as_pdf(doc_id: str) -> bytes:
-    """Export a Google Doc as PDF bytes."""
-    creds = _get_credentials()
-    session = AuthorizedSession(creds)
+PDF_CHUNK_SIZE = 64 * 1024
+
+
+def _start_pdf_export(doc_id: str):
+    """Request the PDF export and check the status; the body is left unread."""
+    session = get_authorized_session()
     url = f"https://docs.google.com/document/d/{doc_id}/export?format=pdf"
-    response = session.get(url)
+    response = session.get(url, stream=True)
     if response.status_code != 200:
         body_preview = response.text[:200] if response.text else "(empty)"
+        response.close()
         logger.error("PDF export failed for doc %s: status=%d body=%s", doc_id, response.status_code, body_preview)
         raise RuntimeError(f"PDF export failed for document {doc_id} with status {response.status_code}")
-    return response.content
+    return response
+
+
+def export_google_doc_as_pdf(doc_id: str) -> bytes:
+    """Export a Google Doc as PDF bytes."""
+    with _start_pdf_export(doc_id) as response:
+        return response.content
+
+
+def stream_google_doc_pdf(doc_id: str) -> Iterator[bytes]:
+    """Export a Google Doc as PDF, yielding it in chunks as Google sends it.
+
+    The export request is made (and its status checked) before this returns,
+    so failures surface as exceptions rather than a truncated download.
+    """
+    response = _start_pdf_export(doc_id)
+
+    def chunks():
+        try:
+            yield from response.iter_content(PDF_CHUNK_SIZE)
+        finally:
+            response.close()
+
+    return chunks()
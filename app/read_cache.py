@@ -0,0 +1,56 @@
+import threading
+import time
+
+# How long a cached list is served without re-querying Postgres. Writes made
+# through the API invalidate their namespace immediately; the TTL only bounds
+# staleness from writes we don't see (scripts, psql).
+READ_CACHE_TTL = 30  # seconds
+
+
+class ReadCache:
+    """In-process cache for hot, rarely-changing GET responses.
+
+    Entries are grouped by namespace ("clients", "contacts", "company") so a
+    write can drop everything derived from the table it touched.
+
+    Each namespace also has a generation, bumped by invalidate(). Read it with
+    generation() before running the query and hand it to put(): if a write
+    invalidated the namespace in between, the rows may predate that write and
+    put() drops them instead of caching them.
+    """
+
+    def __init__(self, ttl: float = READ_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._entries: dict[tuple[str, tuple], tuple[object, float]] = {}
+        self._generations: dict[str, int] = {}
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, *key):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            value, cached_at = entry
+            if time.monotonic() - cached_at > self._ttl:
+                del self._entries[(namespace, key)]
+                return None
+            return value
+
+    def put(self, namespace: str, *key, value, generation: int):
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return
+            self._entries[(namespace, key)] = (value, time.monotonic())
+
+    def invalidate(self, *namespaces: str):
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._entries = {k: e for k, e in self._entries.items() if k[0] not in namespaces}
+
+
+read_cache = ReadCache()
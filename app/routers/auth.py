@@ -1,9 +1,7 @@
 import os
-import shutil
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from ..auth import (
@@ -17,11 +15,14 @@ from ..auth import (
 )
 from ..config import settings
 from ..database import get_db
-from ..utils import generate_id
+from ..read_cache import read_cache
+from ..session_cache import session_cache
+from ..utils import generate_id, refresh_note_authors
 
 router = APIRouter()
 
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5 MB
+AVATAR_CHUNK_SIZE = 64 * 1024
 ALLOWED_AVATAR_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 
 
@@ -40,15 +41,14 @@ def signup(data: AuthRequest, db=Depends(get_db)):
         raise HTTPException(status_code=409, detail="Email already registered. Please log in instead.")
 
     emp_id = generate_id("emp-")
-    now = datetime.now().isoformat()
     pw_hash = hash_password(data.password)
     # Default first_name to email prefix
     first_name = data.email.split("@")[0]
 
     db.execute(
         "INSERT INTO employees (id, first_name, last_name, email, password_hash, created_at, updated_at) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s)",
-        (emp_id, first_name, "", data.email, pw_hash, now, now),
+        "VALUES (%s, %s, %s, %s, %s, NOW(), NOW())",
+        (emp_id, first_name, "", data.email, pw_hash),
     )
 
     try:
@@ -60,7 +60,7 @@ def signup(data: AuthRequest, db=Depends(get_db)):
             detail="Account created but session failed. Please log in.",
         )
 
-    resp = JSONResponse(content={
+    resp = ORJSONResponse(content={
         "id": emp_id,
         "first_name": first_name,
         "last_name": "",
@@ -91,7 +91,7 @@ def login(data: AuthRequest, db=Depends(get_db)):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     token = create_session(db, row["id"])
-    resp = JSONResponse(content={
+    resp = ORJSONResponse(content={
         "id": row["id"],
         "first_name": row["first_name"],
         "last_name": row["last_name"],
@@ -113,14 +113,16 @@ def logout(
     # Delete all sessions for this employee
     db.execute("DELETE FROM sessions WHERE employee_id = %s", (employee["id"],))
     db.commit()
-    resp = JSONResponse(content={"success": True})
+    session_cache.invalidate_employee(employee["id"])
+    resp = ORJSONResponse(content={"success": True})
     resp.delete_cookie(SESSION_COOKIE, path="/")
     return resp
 
 
 @router.get("/me")
 def me(employee: dict = Depends(require_auth)):
-    return employee
+    # Only str/bool/None values, so skip FastAPI's jsonable_encoder walk
+    return ORJSONResponse(content=employee)
 
 
 @router.post("/avatar")
@@ -140,10 +142,17 @@ def upload_avatar(
     filepath = os.path.join(avatars_dir, filename)
 
     try:
+        # Copy in chunks and give up as soon as the limit is passed, rather
+        # than writing an oversized upload to disk before checking it
+        written = 0
         with open(filepath, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+            while chunk := file.file.read(AVATAR_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_AVATAR_SIZE:
+                    break
+                f.write(chunk)
 
-        if os.path.getsize(filepath) > MAX_AVATAR_SIZE:
+        if written > MAX_AVATAR_SIZE:
             os.remove(filepath)
             raise HTTPException(status_code=400, detail="Avatar must be under 5 MB.")
     except HTTPException:
@@ -152,14 +161,16 @@ def upload_avatar(
         raise HTTPException(status_code=500, detail="Failed to save avatar. Please try again.")
 
     avatar_url = f"/uploads/avatars/{filename}"
-    now = datetime.now().isoformat()
     db.execute(
-        "UPDATE employees SET avatar_url = %s, updated_at = %s WHERE id = %s",
-        (avatar_url, now, employee["id"]),
+        "UPDATE employees SET avatar_url = %s, updated_at = NOW() WHERE id = %s",
+        (avatar_url, employee["id"]),
     )
+    refresh_note_authors(db, employee["id"])
     db.commit()
+    session_cache.invalidate_employee(employee["id"])
+    read_cache.invalidate("clients", "contacts")
 
-    return {"avatar_url": avatar_url}
+    return ORJSONResponse(content={"avatar_url": avatar_url})
 
 
 @router.get("/settings")
@@ -179,12 +190,11 @@ def update_user_settings(
     db=Depends(get_db),
 ):
     """Upsert key-value settings for the current user."""
-    for key, value in data.items():
-        db.execute(
-            "INSERT INTO user_settings (employee_id, key, value) VALUES (%s, %s, %s) "
-            "ON CONFLICT (employee_id, key) DO UPDATE SET value = EXCLUDED.value",
-            (employee["id"], key, value),
-        )
+    db.execute_batch(
+        "INSERT INTO user_settings (employee_id, key, value) VALUES %s "
+        "ON CONFLICT (employee_id, key) DO UPDATE SET value = EXCLUDED.value",
+        [(employee["id"], key, value) for key, value in data.items()],
+    )
     db.commit()
     rows = db.execute(
         "SELECT key, value FROM user_settings WHERE employee_id = %s",
@@ -219,7 +229,7 @@ def request_reset(
     token = create_reset_token(db, data.employee_id)
     reset_url = f"/ops/reset-password.html?token={token}"
 
-    return {
+    return ORJSONResponse(content={
         "reset_url": reset_url,
         "employee": {
             "id": target["id"],
@@ -227,7 +237,7 @@ def request_reset(
             "name": f"{target['first_name']} {target['last_name']}".strip(),
         },
         "expires_in": "1 hour",
-    }
+    })
 
 
 @router.post("/reset-password")
@@ -238,14 +248,14 @@ def reset_password(data: ResetPassword, db=Depends(get_db)):
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
     pw_hash = hash_password(data.password)
-    now = datetime.now().isoformat()
     db.execute(
-        "UPDATE employees SET password_hash = %s, updated_at = %s WHERE id = %s",
-        (pw_hash, now, employee_id),
+        "UPDATE employees SET password_hash = %s, updated_at = NOW() WHERE id = %s",
+        (pw_hash, employee_id),
     )
     # Invalidate all existing sessions so they must log in with new password
     db.execute("DELETE FROM sessions WHERE employee_id = %s", (employee_id,))
     # Single commit: token consumption + password update + session invalidation
     db.commit()
+    session_cache.invalidate_employee(employee_id)
 
     return {"success": True}
@@ -1,45 +1,110 @@
-from datetime import datetime
+import re
+from functools import lru_cache
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from psycopg2 import sql
 
 from ..database import get_db
+from ..pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+from ..read_cache import read_cache
 from ..models.client import ClientCreate, ClientNoteCreate, ClientNoteResponse, ClientResponse, ClientUpdate
 from ..utils import generate_id
 
 router = APIRouter()
 
 
+# Must match the expression indexed by idx_clients_search (migration 034)
+_CLIENT_TSV = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(accounting_email, ''))"
+
+_TSQUERY_SPECIAL = re.compile(r"[&|!():*<>'\\]")
+
+
+def _prefix_tsquery(q: str) -> str:
+    """Build a tsquery matching rows with a word starting with every term in q."""
+    terms = (_TSQUERY_SPECIAL.sub(" ", t).strip() for t in q.split())
+    return " & ".join(f"'{t}':*" for t in terms if t)
+
+
 @router.get("", response_model=list[ClientResponse])
 def list_clients(
+    response: Response,
     q: str | None = Query(None, description="Search by name or email"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all rows)"),
+    after: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
     db=Depends(get_db),
 ):
+    if q and (limit or after):
+        # Search results are ranked, not in (name, id) order, so they can't be
+        # paged with a keyset cursor
+        raise HTTPException(status_code=400, detail="limit/after can't be combined with q")
+    cacheable = not (q or limit or after)
+    generation = read_cache.generation("clients")
+    if cacheable and (cached := read_cache.get("clients", "list")) is not None:
+        return cached
     if q:
+        # Word-prefix hits (GIN index) rank first, but fragments from the
+        # middle of a word (e.g. "son" in "Johnson") aren't word prefixes, so
+        # substring matches (trigram indexes, migration 035) are always
+        # included too.
         like = f"%{q}%"
-        rows = db.execute(
-            "SELECT * FROM clients WHERE deleted_at IS NULL "
-            "AND (name ILIKE %s OR email ILIKE %s) ORDER BY name",
-            (like, like),
-        ).fetchall()
+        tsquery = _prefix_tsquery(q)
+        if tsquery:
+            rows = db.execute(
+                f"SELECT * FROM clients WHERE deleted_at IS NULL "
+                f"AND ({_CLIENT_TSV} @@ to_tsquery('simple', %s) "
+                f"OR name ILIKE %s OR accounting_email ILIKE %s) "
+                f"ORDER BY ts_rank({_CLIENT_TSV}, to_tsquery('simple', %s)) DESC, name",
+                (tsquery, like, like, tsquery),
+            ).fetchall()
+        else:
+            rows = db.execute(
+                "SELECT * FROM clients WHERE deleted_at IS NULL "
+                "AND (name ILIKE %s OR accounting_email ILIKE %s) ORDER BY name",
+                (like, like),
+            ).fetchall()
     else:
-        rows = db.execute(
-            "SELECT * FROM clients WHERE deleted_at IS NULL ORDER BY name"
-        ).fetchall()
-    return [dict(r) for r in rows]
-
-
-_NOTE_SELECT = (
-    "SELECT n.id, n.client_id, n.author_id, n.content, n.created_at, "
-    "e.first_name || ' ' || e.last_name AS author_name, "
-    "e.avatar_url AS author_avatar_url "
-    "FROM client_notes n "
-    "LEFT JOIN employees e ON n.author_id = e.id "
+        query = "SELECT * FROM clients WHERE deleted_at IS NULL "
+        params = []
+        if after:
+            query += "AND (name, id) > (%s, %s) "
+            params += decode_cursor(after)
+        query += "ORDER BY name, id"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+        rows = db.execute(query, params).fetchall()
+        rows = paginate(response, rows, limit, lambda r: (r["name"], r["id"]))
+    if cacheable:
+        read_cache.put("clients", "list", value=rows, generation=generation)
+    return rows
+
+
+_NOTE_FIELDS = (
+    "n.id, n.client_id, n.author_id, n.content, n.created_at, "
+    "n.author_name, n.author_avatar_url "
+)
+
+# author_name/author_avatar_url are copied from employees when the note is
+# written (migration 036), so reads don't need to JOIN them.
+_NOTE_SELECT = "SELECT " + _NOTE_FIELDS + "FROM client_notes n "
+
+# Inserts only if the parent client exists (no row back = 404) and returns
+# the note with its author fields, all in one round trip.
+_NOTE_INSERT = (
+    "INSERT INTO client_notes AS n "
+    "(id, client_id, author_id, content, created_at, author_name, author_avatar_url) "
+    "SELECT %s, p.id, %s, %s, NOW(), e.first_name || ' ' || e.last_name, e.avatar_url "
+    "FROM clients p LEFT JOIN employees e ON e.id = %s "
+    "WHERE p.id = %s AND p.deleted_at IS NULL "
+    "RETURNING " + _NOTE_FIELDS
 )
 
 
 @router.get("/notes/{note_id}", response_model=ClientNoteResponse)
 def get_client_note(note_id: str, db=Depends(get_db)):
-    row = db.execute(_NOTE_SELECT + "WHERE n.id = %s", (note_id,)).fetchone()
+    row = db.execute_prepared(
+        "client_note_get", _NOTE_SELECT + "WHERE n.id = %s", (note_id,)
+    ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Note not found")
     return dict(row)
@@ -47,20 +112,23 @@ def get_client_note(note_id: str, db=Depends(get_db)):
 
 @router.delete("/notes/{note_id}")
 def delete_client_note(note_id: str, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT id FROM client_notes WHERE id = %s", (note_id,)
+    deleted = db.execute(
+        "DELETE FROM client_notes WHERE id = %s RETURNING id", (note_id,)
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
-    db.execute("DELETE FROM client_notes WHERE id = %s", (note_id,))
     db.commit()
+    read_cache.invalidate("clients")
     return {"success": True}
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
 def get_client(client_id: str, db=Depends(get_db)):
-    row = db.execute(
-        "SELECT * FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,)
+    row = db.execute_prepared(
+        "client_get",
+        "SELECT id, name, accounting_email, phone, address, notes, created_at, updated_at "
+        "FROM clients WHERE id = %s AND deleted_at IS NULL",
+        (client_id,),
     ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Client not found")
@@ -70,53 +138,58 @@ def get_client(client_id: str, db=Depends(get_db)):
 @router.post("", response_model=ClientResponse, status_code=201)
 def create_client(data: ClientCreate, db=Depends(get_db)):
     client_id = generate_id("c-")
-    now = datetime.now().isoformat()
-    db.execute(
+    row = db.execute(
         "INSERT INTO clients (id, name, accounting_email, phone, address, notes, created_at, updated_at) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-        (client_id, data.name, data.email, data.phone, data.address, data.notes, now, now),
-    )
+        "VALUES (%s, %s, %s, %s, %s, %s, NOW(), NOW()) RETURNING *",
+        (client_id, data.name, data.email, data.phone, data.address, data.notes),
+    ).fetchone()
     db.commit()
-    return {
-        "id": client_id, "name": data.name, "accounting_email": data.email,
-        "phone": data.phone, "address": data.address, "notes": data.notes,
-        "created_at": now, "updated_at": now,
-    }
+    read_cache.invalidate("clients")
+    return dict(row)
+
+
+@lru_cache(maxsize=64)
+def _update_sql(columns: tuple[str, ...]) -> sql.Composed:
+    """UPDATE for one set of patched columns, composed once per shape.
+
+    Column names come from the update model's fields and are quoted as
+    identifiers, never interpolated as raw text.
+    """
+    return sql.SQL(
+        "UPDATE clients SET {}, updated_at = NOW() "
+        "WHERE id = %s AND deleted_at IS NULL RETURNING *"
+    ).format(sql.SQL(", ").join(sql.SQL("{} = %s").format(sql.Identifier(c)) for c in columns))
 
 
 @router.patch("/{client_id}", response_model=ClientResponse)
 def update_client(client_id: str, data: ClientUpdate, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,)
-    ).fetchone()
-    if not existing:
-        raise HTTPException(status_code=404, detail="Client not found")
-
     updates = {k: v for k, v in data.model_dump().items() if v is not None}
     if not updates:
-        return dict(existing)
-
-    updates["updated_at"] = datetime.now().isoformat()
-    set_clause = ", ".join(f"{k} = %s" for k in updates)
-    values = list(updates.values()) + [client_id]
-    db.execute(f"UPDATE clients SET {set_clause} WHERE id = %s", values)
-    db.commit()
-
-    row = db.execute("SELECT * FROM clients WHERE id = %s", (client_id,)).fetchone()
+        row = db.execute(
+            "SELECT * FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,)
+        ).fetchone()
+    else:
+        columns = tuple(sorted(updates))
+        row = db.execute(
+            _update_sql(columns), [updates[c] for c in columns] + [client_id]
+        ).fetchone()
+        db.commit()
+        read_cache.invalidate("clients")
+    if not row:
+        raise HTTPException(status_code=404, detail="Client not found")
     return dict(row)
 
 
 @router.delete("/{client_id}")
 def delete_client(client_id: str, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,)
+    deleted = db.execute(
+        "UPDATE clients SET deleted_at = NOW() WHERE id = %s AND deleted_at IS NULL RETURNING id",
+        (client_id,),
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Client not found")
-
-    now = datetime.now().isoformat()
-    db.execute("UPDATE clients SET deleted_at = %s WHERE id = %s", (now, client_id))
     db.commit()
+    read_cache.invalidate("clients")
     return {"success": True}
 
 
@@ -124,30 +197,42 @@ def delete_client(client_id: str, db=Depends(get_db)):
 
 
 @router.get("/{client_id}/notes", response_model=list[ClientNoteResponse])
-def list_client_notes(client_id: str, db=Depends(get_db)):
-    rows = db.execute(
-        _NOTE_SELECT + "WHERE n.client_id = %s ORDER BY n.created_at DESC",
-        (client_id,),
-    ).fetchall()
-    return [dict(r) for r in rows]
+def list_client_notes(
+    client_id: str,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all notes)"),
+    after: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    db=Depends(get_db),
+):
+    cacheable = not (limit or after)
+    generation = read_cache.generation("clients")
+    if cacheable and (cached := read_cache.get("clients", "notes", client_id)) is not None:
+        return cached
+    query = _NOTE_SELECT + "WHERE n.client_id = %s "
+    params = [client_id]
+    if after:
+        query += "AND (n.created_at, n.id) < (%s, %s) "
+        params += decode_cursor(after)
+    query += "ORDER BY n.created_at DESC, n.id DESC"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit + 1)
+    rows = db.execute(query, params).fetchall()
+    rows = paginate(response, rows, limit, lambda r: (r["created_at"], r["id"]))
+    if cacheable:
+        read_cache.put("clients", "notes", client_id, value=rows, generation=generation)
+    return rows
 
 
 @router.post("/{client_id}/notes", response_model=ClientNoteResponse, status_code=201)
 def add_client_note(client_id: str, data: ClientNoteCreate, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT id FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,)
+    note_id = generate_id("cnote-")
+    row = db.execute(
+        _NOTE_INSERT,
+        (note_id, data.author_id, data.content, data.author_id, client_id),
     ).fetchone()
-    if not existing:
+    if not row:
         raise HTTPException(status_code=404, detail="Client not found")
-
-    note_id = generate_id("cnote-")
-    now = datetime.now().isoformat()
-    db.execute(
-        "INSERT INTO client_notes (id, client_id, author_id, content, created_at) "
-        "VALUES (%s, %s, %s, %s, %s)",
-        (note_id, client_id, data.author_id, data.content, now),
-    )
     db.commit()
-
-    row = db.execute(_NOTE_SELECT + "WHERE n.id = %s", (note_id,)).fetchone()
+    read_cache.invalidate("clients")
     return dict(row)
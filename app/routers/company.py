@@ -1,11 +1,14 @@
-import glob
 import logging
+import os
+import shutil
+import time
 from pathlib import Path, PurePath
 
 from fastapi import APIRouter, Depends, UploadFile, File
 
 from ..database import get_db, get_database_url, set_database_url, clear_database_url
 from ..models.company import CompanySettings
+from ..read_cache import read_cache
 
 logger = logging.getLogger(__name__)
 
@@ -13,19 +16,47 @@ root = Path(__file__).resolve().parent.parent.parent
 
 router = APIRouter()
 
+LOGO_CHUNK_SIZE = 64 * 1024
+
+# Database URL whose company_settings table is known to exist. The check
+# runs once per database (at startup, or after switching via PUT /database)
+# rather than costing a DDL statement and a commit on every request.
+_table_ready_for: str | None = None
+
 
 def _ensure_table(db):
+    global _table_ready_for
+    url = get_database_url()
+    if _table_ready_for == url:
+        return
     db.execute(
         "CREATE TABLE IF NOT EXISTS company_settings (key TEXT PRIMARY KEY, value TEXT)"
     )
     db.commit()
+    _table_ready_for = url
+
+
+def init_company_schema():
+    """Run the company_settings check at startup instead of on the first request."""
+    conns = get_db()
+    try:
+        _ensure_table(next(conns))
+    except Exception:
+        logger.warning("company_settings check failed at startup", exc_info=True)
+    finally:
+        conns.close()
 
 
 @router.get("", response_model=CompanySettings)
 def get_company(db=Depends(get_db)):
+    generation = read_cache.generation("company")
+    if (cached := read_cache.get("company")) is not None:
+        return cached
     _ensure_table(db)
     rows = db.execute("SELECT key, value FROM company_settings").fetchall()
-    return {r["key"]: r["value"] for r in rows}
+    result = {r["key"]: r["value"] for r in rows}
+    read_cache.put("company", value=result, generation=generation)
+    return result
 
 
 def _check_google_access(file_id: str, label: str) -> dict | None:
@@ -53,27 +84,31 @@ def _check_google_access(file_id: str, label: str) -> dict | None:
 @router.put("")
 def save_company(data: CompanySettings, db=Depends(get_db)):
     _ensure_table(db)
-    for key, value in data.model_dump().items():
-        if value is not None:
-            db.execute(
-                "INSERT INTO company_settings (key, value) VALUES (%s, %s) "
-                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-                (key, value),
-            )
+    db.execute_batch(
+        "INSERT INTO company_settings (key, value) VALUES %s "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        [(key, value) for key, value in data.model_dump().items() if value is not None],
+    )
     db.commit()
+    read_cache.invalidate("company")
     rows = db.execute("SELECT key, value FROM company_settings").fetchall()
     result = {r["key"]: r["value"] for r in rows}
 
-    # Check Google access for template and folder if they were just set
+    # Check Google access for template and folder if they were just set.
+    # Each check is a Drive round trip, so run them side by side.
+    targets = [
+        (file_id, label)
+        for file_id, label in (
+            (data.invoice_template_id, "invoice_template_id"),
+            (data.invoice_drive_folder_id, "invoice_drive_folder_id"),
+        )
+        if file_id
+    ]
     warnings = []
-    if data.invoice_template_id:
-        w = _check_google_access(data.invoice_template_id, "invoice_template_id")
-        if w:
-            warnings.append(w)
-    if data.invoice_drive_folder_id:
-        w = _check_google_access(data.invoice_drive_folder_id, "invoice_drive_folder_id")
-        if w:
-            warnings.append(w)
+    if targets:
+        from ..google_sheets import google_executor
+        checks = [google_executor().submit(_check_google_access, *t) for t in targets]
+        warnings = [w for w in (c.result() for c in checks) if w]
     if warnings:
         result["_warnings"] = warnings
 
@@ -81,18 +116,28 @@ def save_company(data: CompanySettings, db=Depends(get_db)):
 
 
 @router.post("/logo")
-async def upload_logo(file: UploadFile = File(...), db=Depends(get_db)):
+def upload_logo(file: UploadFile = File(...), db=Depends(get_db)):
     _ensure_table(db)
     safe_name = PurePath(file.filename).name
     ext = Path(safe_name).suffix.lower() or ".png"
-    # Remove any existing logo files
-    for old in glob.glob(str(root / "uploads" / "logo.*")):
-        Path(old).unlink()
-    # Write new file
-    dest = root / "uploads" / f"logo{ext}"
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    content = await file.read()
-    dest.write_bytes(content)
+    uploads = root / "uploads"
+    uploads.mkdir(parents=True, exist_ok=True)
+    dest = uploads / f"logo{ext}"
+    # Stream to a temp file (hidden, so the glob below skips it) and swap it
+    # in atomically; readers never see a half-written logo
+    tmp = uploads / f".logo{ext}.tmp"
+    try:
+        with open(tmp, "wb") as out:
+            shutil.copyfileobj(file.file, out, LOGO_CHUNK_SIZE)
+        os.replace(tmp, dest)
+    except BaseException:
+        # Don't leave a partial upload behind (client disconnect, full disk)
+        tmp.unlink(missing_ok=True)
+        raise
+    # Remove any existing logo files with a different extension
+    for old in uploads.glob("logo.*"):
+        if old != dest:
+            old.unlink()
     logo_url = f"/uploads/logo{ext}"
     # Save logo_url in settings
     db.execute(
@@ -103,16 +148,23 @@ async def upload_logo(file: UploadFile = File(...), db=Depends(get_db)):
     # Remove old base64 data
     db.execute("DELETE FROM company_settings WHERE key IN ('logo_data', 'logo_filename')")
     db.commit()
+    read_cache.invalidate("company")
     return {"logo_url": logo_url}
 
 
 # --- Database Connection ---
 
-@router.get("/database")
-def get_database_connection():
-    """Return the current database URL and connection status."""
-    url = get_database_url()
-    # Test the connection
+# How long a connection check result is reused, so repeated status reads
+# don't each open (and possibly wait 3 s on) a fresh connection.
+DB_STATUS_TTL = 10  # seconds
+
+_db_status: dict[str, tuple[float, bool, str | None]] = {}
+
+
+def _check_database(url: str) -> tuple[bool, str | None]:
+    cached = _db_status.get(url)
+    if cached and time.monotonic() - cached[0] < DB_STATUS_TTL:
+        return cached[1], cached[2]
     connected = False
     error = None
     try:
@@ -122,6 +174,15 @@ def get_database_connection():
         connected = True
     except Exception as e:
         error = str(e)
+    _db_status[url] = (time.monotonic(), connected, error)
+    return connected, error
+
+
+@router.get("/database")
+def get_database_connection():
+    """Return the current database URL and connection status."""
+    url = get_database_url()
+    connected, error = _check_database(url)
     return {"database_url": url, "connected": connected, "error": error}
 
 
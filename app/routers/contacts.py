@@ -1,8 +1,12 @@
 from datetime import datetime
+from functools import lru_cache
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from psycopg2 import sql
 
 from ..database import get_db
+from ..pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+from ..read_cache import read_cache
 from ..models.contact import ContactCreate, ContactNoteCreate, ContactNoteResponse, ContactResponse, ContactUpdate
 from ..utils import generate_id
 from ..vcf_parser import parse_vcards
@@ -12,19 +16,33 @@ router = APIRouter()
 
 @router.get("", response_model=list[ContactResponse])
 def list_contacts(
+    response: Response,
     client_id: str | None = Query(None, description="Filter by client"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all rows)"),
+    after: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
     db=Depends(get_db),
 ):
+    cacheable = not (limit or after)
+    generation = read_cache.generation("contacts")
+    if cacheable and (cached := read_cache.get("contacts", "list", client_id)) is not None:
+        return cached
+    query = "SELECT * FROM contacts WHERE deleted_at IS NULL "
+    params = []
     if client_id:
-        rows = db.execute(
-            "SELECT * FROM contacts WHERE client_id = %s AND deleted_at IS NULL ORDER BY name",
-            (client_id,),
-        ).fetchall()
-    else:
-        rows = db.execute(
-            "SELECT * FROM contacts WHERE deleted_at IS NULL ORDER BY name"
-        ).fetchall()
-    return [dict(r) for r in rows]
+        query += "AND client_id = %s "
+        params.append(client_id)
+    if after:
+        query += "AND (name, id) > (%s, %s) "
+        params += decode_cursor(after)
+    query += "ORDER BY name, id"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit + 1)
+    rows = db.execute(query, params).fetchall()
+    rows = paginate(response, rows, limit, lambda r: (r["name"], r["id"]))
+    if cacheable:
+        read_cache.put("contacts", "list", client_id, value=rows, generation=generation)
+    return rows
 
 
 @router.post("/import")
@@ -131,6 +149,7 @@ async def import_vcf(
 
     if commit:
         db.commit()
+        read_cache.invalidate("contacts", "clients")
 
     created = sum(1 for e in plan if e["action"] == "create")
     updated = sum(1 for e in plan if e["action"] == "update")
@@ -146,18 +165,32 @@ async def import_vcf(
     }
 
 
-_NOTE_SELECT = (
-    "SELECT n.id, n.contact_id, n.author_id, n.content, n.created_at, "
-    "e.first_name || ' ' || e.last_name AS author_name, "
-    "e.avatar_url AS author_avatar_url "
-    "FROM contact_notes n "
-    "LEFT JOIN employees e ON n.author_id = e.id "
+_NOTE_FIELDS = (
+    "n.id, n.contact_id, n.author_id, n.content, n.created_at, "
+    "n.author_name, n.author_avatar_url "
+)
+
+# author_name/author_avatar_url are copied from employees when the note is
+# written (migration 036), so reads don't need to JOIN them.
+_NOTE_SELECT = "SELECT " + _NOTE_FIELDS + "FROM contact_notes n "
+
+# Inserts only if the parent contact exists (no row back = 404) and returns
+# the note with its author fields, all in one round trip.
+_NOTE_INSERT = (
+    "INSERT INTO contact_notes AS n "
+    "(id, contact_id, author_id, content, created_at, author_name, author_avatar_url) "
+    "SELECT %s, p.id, %s, %s, NOW(), e.first_name || ' ' || e.last_name, e.avatar_url "
+    "FROM contacts p LEFT JOIN employees e ON e.id = %s "
+    "WHERE p.id = %s AND p.deleted_at IS NULL "
+    "RETURNING " + _NOTE_FIELDS
 )
 
 
 @router.get("/notes/{note_id}", response_model=ContactNoteResponse)
 def get_contact_note(note_id: str, db=Depends(get_db)):
-    row = db.execute(_NOTE_SELECT + "WHERE n.id = %s", (note_id,)).fetchone()
+    row = db.execute_prepared(
+        "contact_note_get", _NOTE_SELECT + "WHERE n.id = %s", (note_id,)
+    ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Note not found")
     return dict(row)
@@ -165,20 +198,23 @@ def get_contact_note(note_id: str, db=Depends(get_db)):
 
 @router.delete("/notes/{note_id}")
 def delete_contact_note(note_id: str, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT id FROM contact_notes WHERE id = %s", (note_id,)
+    deleted = db.execute(
+        "DELETE FROM contact_notes WHERE id = %s RETURNING id", (note_id,)
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
-    db.execute("DELETE FROM contact_notes WHERE id = %s", (note_id,))
     db.commit()
+    read_cache.invalidate("contacts")
     return {"success": True}
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
 def get_contact(contact_id: str, db=Depends(get_db)):
-    row = db.execute(
-        "SELECT * FROM contacts WHERE id = %s AND deleted_at IS NULL", (contact_id,)
+    row = db.execute_prepared(
+        "contact_get",
+        "SELECT id, name, email, phone, role, notes, client_id, created_at, updated_at "
+        "FROM contacts WHERE id = %s AND deleted_at IS NULL",
+        (contact_id,),
     ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Contact not found")
@@ -188,53 +224,58 @@ def get_contact(contact_id: str, db=Depends(get_db)):
 @router.post("", response_model=ContactResponse, status_code=201)
 def create_contact(data: ContactCreate, db=Depends(get_db)):
     contact_id = generate_id("ct-")
-    now = datetime.now().isoformat()
-    db.execute(
+    row = db.execute(
         "INSERT INTO contacts (id, name, email, phone, role, notes, client_id, created_at, updated_at) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-        (contact_id, data.name, data.email, data.phone, data.role, data.notes, data.client_id, now, now),
-    )
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW()) RETURNING *",
+        (contact_id, data.name, data.email, data.phone, data.role, data.notes, data.client_id),
+    ).fetchone()
     db.commit()
-    return {
-        "id": contact_id, "name": data.name, "email": data.email,
-        "phone": data.phone, "role": data.role, "notes": data.notes, "client_id": data.client_id,
-        "created_at": now, "updated_at": now,
-    }
+    read_cache.invalidate("contacts")
+    return dict(row)
+
+
+@lru_cache(maxsize=64)
+def _update_sql(columns: tuple[str, ...]) -> sql.Composed:
+    """UPDATE for one set of patched columns, composed once per shape.
+
+    Column names come from the update model's fields and are quoted as
+    identifiers, never interpolated as raw text.
+    """
+    return sql.SQL(
+        "UPDATE contacts SET {}, updated_at = NOW() "
+        "WHERE id = %s AND deleted_at IS NULL RETURNING *"
+    ).format(sql.SQL(", ").join(sql.SQL("{} = %s").format(sql.Identifier(c)) for c in columns))
 
 
 @router.patch("/{contact_id}", response_model=ContactResponse)
 def update_contact(contact_id: str, data: ContactUpdate, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM contacts WHERE id = %s AND deleted_at IS NULL", (contact_id,)
-    ).fetchone()
-    if not existing:
-        raise HTTPException(status_code=404, detail="Contact not found")
-
     updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
     if not updates:
-        return dict(existing)
-
-    updates["updated_at"] = datetime.now().isoformat()
-    set_clause = ", ".join(f"{k} = %s" for k in updates)
-    values = list(updates.values()) + [contact_id]
-    db.execute(f"UPDATE contacts SET {set_clause} WHERE id = %s", values)
-    db.commit()
-
-    row = db.execute("SELECT * FROM contacts WHERE id = %s", (contact_id,)).fetchone()
+        row = db.execute(
+            "SELECT * FROM contacts WHERE id = %s AND deleted_at IS NULL", (contact_id,)
+        ).fetchone()
+    else:
+        columns = tuple(sorted(updates))
+        row = db.execute(
+            _update_sql(columns), [updates[c] for c in columns] + [contact_id]
+        ).fetchone()
+        db.commit()
+        read_cache.invalidate("contacts")
+    if not row:
+        raise HTTPException(status_code=404, detail="Contact not found")
     return dict(row)
 
 
 @router.delete("/{contact_id}")
 def delete_contact(contact_id: str, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM contacts WHERE id = %s AND deleted_at IS NULL", (contact_id,)
+    deleted = db.execute(
+        "UPDATE contacts SET deleted_at = NOW() WHERE id = %s AND deleted_at IS NULL RETURNING id",
+        (contact_id,),
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Contact not found")
-
-    now = datetime.now().isoformat()
-    db.execute("UPDATE contacts SET deleted_at = %s WHERE id = %s", (now, contact_id))
     db.commit()
+    read_cache.invalidate("contacts")
     return {"success": True}
 
 
@@ -260,30 +301,42 @@ def list_contact_projects(contact_id: str, db=Depends(get_db)):
 
 
 @router.get("/{contact_id}/notes", response_model=list[ContactNoteResponse])
-def list_contact_notes(contact_id: str, db=Depends(get_db)):
-    rows = db.execute(
-        _NOTE_SELECT + "WHERE n.contact_id = %s ORDER BY n.created_at DESC",
-        (contact_id,),
-    ).fetchall()
-    return [dict(r) for r in rows]
+def list_contact_notes(
+    contact_id: str,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all notes)"),
+    after: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    db=Depends(get_db),
+):
+    cacheable = not (limit or after)
+    generation = read_cache.generation("contacts")
+    if cacheable and (cached := read_cache.get("contacts", "notes", contact_id)) is not None:
+        return cached
+    query = _NOTE_SELECT + "WHERE n.contact_id = %s "
+    params = [contact_id]
+    if after:
+        query += "AND (n.created_at, n.id) < (%s, %s) "
+        params += decode_cursor(after)
+    query += "ORDER BY n.created_at DESC, n.id DESC"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit + 1)
+    rows = db.execute(query, params).fetchall()
+    rows = paginate(response, rows, limit, lambda r: (r["created_at"], r["id"]))
+    if cacheable:
+        read_cache.put("contacts", "notes", contact_id, value=rows, generation=generation)
+    return rows
 
 
 @router.post("/{contact_id}/notes", response_model=ContactNoteResponse, status_code=201)
 def add_contact_note(contact_id: str, data: ContactNoteCreate, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT id FROM contacts WHERE id = %s AND deleted_at IS NULL", (contact_id,)
+    note_id = generate_id("ctnote-")
+    row = db.execute(
+        _NOTE_INSERT,
+        (note_id, data.author_id, data.content, data.author_id, contact_id),
     ).fetchone()
-    if not existing:
+    if not row:
         raise HTTPException(status_code=404, detail="Contact not found")
-
-    note_id = generate_id("ctnote-")
-    now = datetime.now().isoformat()
-    db.execute(
-        "INSERT INTO contact_notes (id, contact_id, author_id, content, created_at) "
-        "VALUES (%s, %s, %s, %s, %s)",
-        (note_id, contact_id, data.author_id, data.content, now),
-    )
     db.commit()
-
-    row = db.execute(_NOTE_SELECT + "WHERE n.id = %s", (note_id,)).fetchone()
+    read_cache.invalidate("contacts")
     return dict(row)
@@ -16,41 +16,76 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def _compute_task_billing(db, contract_id: str, tasks: list[dict]) -> list[dict]:
-    """Compute billed_amount and billed_percent from active invoice line items."""
-    # Sum line item amounts per task name from non-deleted invoices
-    rows = db.execute(
-        "SELECT li.name, COALESCE(SUM(li.amount), 0) as total_billed "
-        "FROM invoice_line_items li "
-        "JOIN invoices inv ON li.invoice_id = inv.id "
-        "WHERE inv.contract_id = %s AND inv.deleted_at IS NULL "
-        "GROUP BY li.name",
+# Columns are listed rather than * because both statements below are
+# prepared (see PgConnection.execute_prepared).
+_CONTRACT_COLUMNS = (
+    "id, project_id, file_path, total_amount, signed_at, notes, "
+    "created_at, updated_at, deleted_at"
+)
+
+# A contract's tasks, each with total_billed: the sum of line item amounts
+# for that task name on the contract's non-deleted invoices. Params are
+# (contract_id, contract_id).
+_TASKS_WITH_BILLING = (
+    "SELECT ct.id, ct.contract_id, ct.sort_order, ct.name, ct.description, ct.amount, "
+    "ct.billing_type, ct.billed_amount, ct.billed_percent, ct.created_at, ct.updated_at, "
+    "COALESCE(b.total_billed, 0) AS total_billed "
+    "FROM contract_tasks ct "
+    "LEFT JOIN ("
+    "SELECT li.name, SUM(li.amount) AS total_billed "
+    "FROM invoice_line_items li "
+    "JOIN invoices inv ON li.invoice_id = inv.id "
+    "WHERE inv.contract_id = %s AND inv.deleted_at IS NULL "
+    "GROUP BY li.name"
+    ") b ON b.name = ct.name "
+    "WHERE ct.contract_id = %s "
+)
+
+
+def _select_contract(db, contract_id: str):
+    """The contract row, or None if missing or deleted. Every handler here
+    starts with this lookup, so it runs as a prepared statement."""
+    return db.execute_prepared(
+        "contract_get",
+        "SELECT " + _CONTRACT_COLUMNS + " FROM contracts WHERE id = %s AND deleted_at IS NULL",
         (contract_id,),
+    ).fetchone()
+
+
+def _select_tasks_with_billing(db, contract_id: str):
+    return db.execute_prepared(
+        "contract_tasks_billing",
+        _TASKS_WITH_BILLING + "ORDER BY ct.sort_order",
+        (contract_id, contract_id),
     ).fetchall()
-    billed_by_name = {r["name"]: float(r["total_billed"]) for r in rows}
 
-    for task in tasks:
-        billed = billed_by_name.get(task["name"], 0)
+
+def _get_tasks_with_billing(db, contract_id: str) -> list[dict]:
+    """Load a contract's tasks with billed_amount and billed_percent computed
+    from active invoice line items, in one query."""
+    rows = _select_tasks_with_billing(db, contract_id)
+    tasks = []
+    for r in rows:
+        task = dict(r)
+        billed = float(task.pop("total_billed"))
         task["billed_amount"] = billed
         task["billed_percent"] = (billed / float(task["amount"]) * 100) if task["amount"] else 0
+        tasks.append(task)
     return tasks
 
 
+def _serialize_contract(contract_row, tasks: list[dict]) -> dict:
+    contract = dict(contract_row)
+    contract["tasks"] = tasks
+    return contract
+
+
 @router.get("/{contract_id}")
 def get_contract(contract_id: str, db=Depends(get_db)):
-    row = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
-    ).fetchone()
+    row = _select_contract(db, contract_id)
     if not row:
         raise HTTPException(status_code=404, detail="Contract not found")
-
-    contract = dict(row)
-    tasks = db.execute(
-        "SELECT * FROM contract_tasks WHERE contract_id = %s ORDER BY sort_order",
-        (contract_id,),
-    ).fetchall()
-    contract["tasks"] = _compute_task_billing(db, contract_id, [dict(t) for t in tasks])
-    return contract
+    return _serialize_contract(row, _get_tasks_with_billing(db, contract_id))
 
 
 @router.post("", status_code=201)
@@ -70,22 +105,23 @@ def create_contract(data: ContractCreate, db=Depends(get_db)):
     if data.tasks:
         total = sum(t.get("amount", 0) for t in data.tasks)
 
-    db.execute(
+    contract = db.execute(
         "INSERT INTO contracts (id, project_id, total_amount, signed_at, file_path, notes, created_at, updated_at) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING *",
         (contract_id, data.project_id, total, data.signed_at, data.file_path, data.notes, now, now),
-    )
+    ).fetchone()
 
-    # Create inline tasks if provided
-    if data.tasks:
-        for i, task in enumerate(data.tasks):
-            task_id = generate_id("ctask-")
-            db.execute(
-                "INSERT INTO contract_tasks (id, contract_id, sort_order, name, description, amount, billing_type, created_at, updated_at) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                (task_id, contract_id, i + 1, task["name"], task.get("description"), task.get("amount", 0),
-                 task.get("billing_type", "fixed"), now, now),
-            )
+    # Create inline tasks if provided. A new contract has no invoices yet,
+    # so nothing is billed and the response is built from what we inserted.
+    tasks = db.execute_batch(
+        "INSERT INTO contract_tasks (id, contract_id, sort_order, name, description, amount, billing_type, created_at, updated_at) "
+        "VALUES %s RETURNING *",
+        [(generate_id("ctask-"), contract_id, i + 1, task["name"], task.get("description"), task.get("amount", 0),
+          task.get("billing_type", "fixed"), now, now)
+         for i, task in enumerate(data.tasks or [])],
+        fetch=True,
+    )
+    tasks = sorted((dict(t, billed_amount=0.0, billed_percent=0.0) for t in tasks), key=lambda t: t["sort_order"])
 
     # Auto-create deliverables if contract is signed on creation
     if data.signed_at:
@@ -93,14 +129,12 @@ def create_contract(data: ContractCreate, db=Depends(get_db)):
 
     db.commit()
     event_bus.publish(data.project_id, "contract_updated", contract_id)
-    return get_contract(contract_id, db)
+    return _serialize_contract(contract, tasks)
 
 
 @router.patch("/{contract_id}")
 def update_contract(contract_id: str, data: ContractUpdate, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
-    ).fetchone()
+    existing = _select_contract(db, contract_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Contract not found")
 
@@ -115,27 +149,29 @@ def update_contract(contract_id: str, data: ContractUpdate, db=Depends(get_db)):
     if data.notes is not None:
         field_updates["notes"] = data.notes
 
+    contract = existing
     if field_updates:
         field_updates["updated_at"] = now
         set_clause = ", ".join(f"{k} = %s" for k in field_updates)
         values = list(field_updates.values()) + [contract_id]
-        db.execute(f"UPDATE contracts SET {set_clause} WHERE id = %s", values)
+        contract = db.execute(
+            f"UPDATE contracts SET {set_clause} WHERE id = %s RETURNING *", values
+        ).fetchone()
 
     # Replace tasks if provided — delete existing and re-create
     if data.tasks is not None:
         db.execute("DELETE FROM contract_tasks WHERE contract_id = %s", (contract_id,))
-        for i, task in enumerate(data.tasks):
-            task_id = generate_id("ctask-")
-            db.execute(
-                "INSERT INTO contract_tasks (id, contract_id, sort_order, name, description, amount, "
-                "billing_type, billed_amount, billed_percent, created_at, updated_at) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                (task_id, contract_id, i + 1, task["name"], task.get("description"),
-                 task.get("amount", 0), task.get("billing_type", "fixed"),
-                 task.get("billed_amount", 0), task.get("billed_percent", 0),
-                 now, now),
-            )
-        _update_contract_total(db, contract_id)
+        db.execute_batch(
+            "INSERT INTO contract_tasks (id, contract_id, sort_order, name, description, amount, "
+            "billing_type, billed_amount, billed_percent, created_at, updated_at) "
+            "VALUES %s",
+            [(generate_id("ctask-"), contract_id, i + 1, task["name"], task.get("description"),
+              task.get("amount", 0), task.get("billing_type", "fixed"),
+              task.get("billed_amount", 0), task.get("billed_percent", 0),
+              now, now)
+             for i, task in enumerate(data.tasks)],
+        )
+        contract = _update_contract_total(db, contract_id)
 
     # Auto-create deliverables when contract is first signed
     if "signed_at" in field_updates and not existing["signed_at"]:
@@ -143,16 +179,14 @@ def update_contract(contract_id: str, data: ContractUpdate, db=Depends(get_db)):
 
     db.commit()
     event_bus.publish(existing["project_id"], "contract_updated", contract_id)
-    return get_contract(contract_id, db)
+    return _serialize_contract(contract, _get_tasks_with_billing(db, contract_id))
 
 
 @router.post("/{contract_id}/deliverables")
 def generate_deliverables(contract_id: str, db=Depends(get_db)):
     """Manually trigger deliverable creation for a contract's tasks.
     Backfills contracts that were signed before the deliverables feature shipped."""
-    contract = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
-    ).fetchone()
+    contract = _select_contract(db, contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
@@ -180,16 +214,15 @@ def generate_deliverables(contract_id: str, db=Depends(get_db)):
 
 @router.delete("/{contract_id}")
 def delete_contract(contract_id: str, db=Depends(get_db)):
-    existing = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
+    now = datetime.now().isoformat()
+    deleted = db.execute(
+        "UPDATE contracts SET deleted_at = %s WHERE id = %s AND deleted_at IS NULL RETURNING project_id",
+        (now, contract_id),
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Contract not found")
-
-    now = datetime.now().isoformat()
-    db.execute("UPDATE contracts SET deleted_at = %s WHERE id = %s", (now, contract_id))
     db.commit()
-    event_bus.publish(existing["project_id"], "contract_updated", contract_id)
+    event_bus.publish(deleted["project_id"], "contract_updated", contract_id)
     return {"success": True}
 
 
@@ -201,9 +234,7 @@ def add_contract_task(
     data: ContractTaskCreate,
     db=Depends(get_db),
 ):
-    contract = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
-    ).fetchone()
+    contract = _select_contract(db, contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
@@ -223,11 +254,11 @@ def add_contract_task(
     )
 
     # Update contract total
-    _update_contract_total(db, contract_id)
+    contract = _update_contract_total(db, contract_id)
     db.commit()
     event_bus.publish(contract["project_id"], "contract_updated", contract_id)
 
-    return get_contract(contract_id, db)
+    return _serialize_contract(contract, _get_tasks_with_billing(db, contract_id))
 
 
 @router.patch("/{contract_id}/tasks/{task_id}")
@@ -237,28 +268,33 @@ def update_contract_task(
     data: ContractTaskUpdate,
     db=Depends(get_db),
 ):
-    existing = db.execute(
-        "SELECT * FROM contract_tasks WHERE id = %s AND contract_id = %s",
-        (task_id, contract_id),
-    ).fetchone()
-    if not existing:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     updates = {k: v for k, v in data.model_dump().items() if v is not None}
     if not updates:
+        existing = db.execute(
+            "SELECT id FROM contract_tasks WHERE id = %s AND contract_id = %s",
+            (task_id, contract_id),
+        ).fetchone()
+        if not existing:
+            raise HTTPException(status_code=404, detail="Task not found")
         return get_contract(contract_id, db)
 
     updates["updated_at"] = datetime.now().isoformat()
     set_clause = ", ".join(f"{k} = %s" for k in updates)
-    values = list(updates.values()) + [task_id]
-    db.execute(f"UPDATE contract_tasks SET {set_clause} WHERE id = %s", values)
+    values = list(updates.values()) + [task_id, contract_id]
+    updated = db.execute(
+        f"UPDATE contract_tasks SET {set_clause} WHERE id = %s AND contract_id = %s RETURNING id",
+        values,
+    ).fetchone()
+    if not updated:
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    _update_contract_total(db, contract_id)
+    contract = _update_contract_total(db, contract_id)
     db.commit()
-    contract = db.execute("SELECT project_id FROM contracts WHERE id = %s", (contract_id,)).fetchone()
     if contract:
         event_bus.publish(contract["project_id"], "contract_updated", contract_id)
-    return get_contract(contract_id, db)
+    if not contract or contract["deleted_at"]:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    return _serialize_contract(contract, _get_tasks_with_billing(db, contract_id))
 
 
 @router.delete("/{contract_id}/tasks/{task_id}")
@@ -267,17 +303,15 @@ def delete_contract_task(
     task_id: str,
     db=Depends(get_db),
 ):
-    existing = db.execute(
-        "SELECT * FROM contract_tasks WHERE id = %s AND contract_id = %s",
+    deleted = db.execute(
+        "DELETE FROM contract_tasks WHERE id = %s AND contract_id = %s RETURNING id",
         (task_id, contract_id),
     ).fetchone()
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.execute("DELETE FROM contract_tasks WHERE id = %s", (task_id,))
-    _update_contract_total(db, contract_id)
+    contract = _update_contract_total(db, contract_id)
     db.commit()
-    contract = db.execute("SELECT project_id FROM contracts WHERE id = %s", (contract_id,)).fetchone()
     if contract:
         event_bus.publish(contract["project_id"], "contract_updated", contract_id)
     return {"success": True}
@@ -301,9 +335,7 @@ def create_invoice_from_contract(
     data: InvoiceFromContract,
     db=Depends(get_db),
 ):
-    contract = db.execute(
-        "SELECT * FROM contracts WHERE id = %s AND deleted_at IS NULL", (contract_id,)
-    ).fetchone()
+    contract = _select_contract(db, contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
@@ -314,25 +346,19 @@ def create_invoice_from_contract(
     # Determine invoice number (use override if provided)
     invoice_number = data.invoice_number or next_invoice_number(db, project_id)
 
-    # Find previous invoice in chain
-    prev_invoice = db.execute(
-        "SELECT id FROM invoices WHERE project_id = %s AND contract_id = %s AND deleted_at IS NULL "
-        "ORDER BY created_at DESC LIMIT 1",
-        (project_id, contract_id),
-    ).fetchone()
-    previous_invoice_id = prev_invoice["id"] if prev_invoice else None
-
-    # Calculate line items from tasks
+    # Calculate line items from tasks. Previous billing is computed from
+    # active invoices (not the stored column), for all tasks in one query.
+    tasks_by_id = {
+        t["id"]: t
+        for t in _select_tasks_with_billing(db, contract_id)
+    }
     total_due = Decimal(0)
     line_items = []
 
     for task_spec in data.tasks:
         task_id = task_spec["task_id"]
 
-        task = db.execute(
-            "SELECT * FROM contract_tasks WHERE id = %s AND contract_id = %s",
-            (task_id, contract_id),
-        ).fetchone()
+        task = tasks_by_id.get(task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
@@ -347,14 +373,7 @@ def create_invoice_from_contract(
             percent_this = task_spec["percent_this_invoice"]
             current_billing = task_amount * percent_this / 100
 
-        # Compute previous billing from active invoices (not stored column)
-        prev_row = db.execute(
-            "SELECT COALESCE(SUM(li.amount), 0) as total "
-            "FROM invoice_line_items li JOIN invoices inv ON li.invoice_id = inv.id "
-            "WHERE inv.contract_id = %s AND inv.deleted_at IS NULL AND li.name = %s",
-            (contract_id, task["name"]),
-        ).fetchone()
-        previous_billing = float(prev_row["total"])
+        previous_billing = float(task["total_billed"])
 
         line_items.append({
             "task_id": task_id,
@@ -368,42 +387,47 @@ def create_invoice_from_contract(
         })
         total_due += Decimal(str(current_billing))
 
-    # Create invoice
+    # Create invoice, chained to the contract's latest invoice, and make it
+    # the project's current invoice, in one round trip
     invoice_date = data.invoice_date or now[:10]
-    db.execute(
+    invoice = db.execute(
+        "WITH prev AS ("
+        "SELECT id FROM invoices WHERE project_id = %s AND contract_id = %s AND deleted_at IS NULL "
+        "ORDER BY created_at DESC LIMIT 1"
+        "), ins AS ("
         "INSERT INTO invoices (id, invoice_number, project_id, contract_id, previous_invoice_id, "
-        "type, total_due, invoice_date, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, 'task', %s, %s, %s, %s)",
-        (inv_id, invoice_number, project_id, contract_id, previous_invoice_id, total_due, invoice_date, now, now),
-    )
+        "type, total_due, invoice_date, created_at, updated_at) "
+        "SELECT %s, %s, %s, %s, (SELECT id FROM prev), 'task', %s, %s, %s, %s "
+        "RETURNING *"
+        "), cur AS ("
+        "UPDATE projects SET current_invoice_id = %s WHERE id = %s"
+        ") SELECT * FROM ins",
+        (project_id, contract_id,
+         inv_id, invoice_number, project_id, contract_id, total_due, invoice_date, now, now,
+         inv_id, project_id),
+    ).fetchone()
 
     # Create line items
-    for i, li in enumerate(line_items):
-        li_id = generate_id("li-")
-        db.execute(
-            "INSERT INTO invoice_line_items (id, invoice_id, sort_order, name, description, "
-            "quantity, unit_price, amount, previous_billing, billing_type, created_at) "
-            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-            (li_id, inv_id, i + 1, li["name"], li["description"],
-             li["quantity"], li["unit_price"], li["amount"], li["previous_billing"],
-             li.get("billing_type", "fixed"), now),
-        )
-
-    # Set as current invoice on project
-    db.execute("UPDATE projects SET current_invoice_id = %s WHERE id = %s", (inv_id, project_id))
+    db.execute_batch(
+        "INSERT INTO invoice_line_items (id, invoice_id, sort_order, name, description, "
+        "quantity, unit_price, amount, previous_billing, billing_type, created_at) "
+        "VALUES %s",
+        [(generate_id("li-"), inv_id, i + 1, li["name"], li["description"],
+          li["quantity"], li["unit_price"], li["amount"], li["previous_billing"],
+          li.get("billing_type", "fixed"), now)
+         for i, li in enumerate(line_items)],
+    )
 
     db.commit()
     event_bus.publish(project_id, "invoice_updated", inv_id)
-
-    invoice = db.execute("SELECT * FROM invoices WHERE id = %s", (inv_id,)).fetchone()
     return dict(invoice)
 
 
 def _update_contract_total(db, contract_id: str):
-    total = db.execute(
-        "SELECT COALESCE(SUM(amount), 0) as total FROM contract_tasks WHERE contract_id = %s",
-        (contract_id,),
-    ).fetchone()["total"]
-    db.execute(
-        "UPDATE contracts SET total_amount = %s, updated_at = %s WHERE id = %s",
-        (total, datetime.now().isoformat(), contract_id),
-    )
+    """Recompute total_amount from the tasks and return the updated contract row."""
+    return db.execute(
+        "UPDATE contracts SET total_amount = "
+        "(SELECT COALESCE(SUM(amount), 0) FROM contract_tasks WHERE contract_id = %s), "
+        "updated_at = %s WHERE id = %s RETURNING *",
+        (contract_id, datetime.now().isoformat(), contract_id),
+    ).fetchone()
@@ -4,10 +4,15 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..database import get_db
 from ..models.employee import EmployeeCreate, EmployeeResponse, EmployeeUpdate
-from ..utils import generate_id
+from ..read_cache import read_cache
+from ..session_cache import session_cache
+from ..utils import generate_id, refresh_note_authors
 
 router = APIRouter()
 
+# Must match the expression indexed by idx_employees_search_trgm (migration 039)
+_EMPLOYEE_SEARCH = "(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, ''))"
+
 
 @router.get("", response_model=list[EmployeeResponse])
 def list_employees(
@@ -15,11 +20,10 @@ def list_employees(
     db=Depends(get_db),
 ):
     if q:
-        like = f"%{q}%"
         rows = db.execute(
-            "SELECT * FROM employees WHERE deleted_at IS NULL "
-            "AND (first_name ILIKE %s OR last_name ILIKE %s OR email ILIKE %s) ORDER BY first_name, last_name",
-            (like, like, like),
+            f"SELECT * FROM employees WHERE deleted_at IS NULL "
+            f"AND {_EMPLOYEE_SEARCH} ILIKE %s ORDER BY first_name, last_name",
+            (f"%{q}%",),
         ).fetchall()
     else:
         rows = db.execute(
@@ -30,8 +34,11 @@ def list_employees(
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 def get_employee(employee_id: str, db=Depends(get_db)):
-    row = db.execute(
-        "SELECT * FROM employees WHERE id = %s AND deleted_at IS NULL", (employee_id,)
+    row = db.execute_prepared(
+        "employee_get",
+        "SELECT id, first_name, last_name, email, bot_id, avatar_url, is_active, "
+        "created_at, updated_at FROM employees WHERE id = %s AND deleted_at IS NULL",
+        (employee_id,),
     ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -71,7 +78,11 @@ def update_employee(employee_id: str, data: EmployeeUpdate, db=Depends(get_db)):
     set_clause = ", ".join(f"{k} = %s" for k in updates)
     values = list(updates.values()) + [employee_id]
     db.execute(f"UPDATE employees SET {set_clause} WHERE id = %s", values)
+    if updates.keys() & {"first_name", "last_name", "avatar_url"}:
+        refresh_note_authors(db, employee_id)
     db.commit()
+    session_cache.invalidate_employee(employee_id)
+    read_cache.invalidate("clients", "contacts")
 
     row = db.execute("SELECT * FROM employees WHERE id = %s", (employee_id,)).fetchone()
     return dict(row)
@@ -88,4 +99,5 @@ def delete_employee(employee_id: str, db=Depends(get_db)):
     now = datetime.now().isoformat()
     db.execute("UPDATE employees SET deleted_at = %s WHERE id = %s", (now, employee_id))
     db.commit()
+    session_cache.invalidate_employee(employee_id)
     return {"success": True}
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 
 from ..config import settings
 from ..database import get_db
+from ..read_cache import read_cache
 from ..utils import generate_id
 
 router = APIRouter()
@@ -71,6 +72,7 @@ async def submit_proposal(
     )
 
     db.commit()
+    read_cache.invalidate("clients")
     return {"success": True, "proposal_id": prop_id}
 
 
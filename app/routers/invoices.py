@@ -4,6 +4,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from ..company_settings import get_settings
 from ..database import get_db
 from ..events import event_bus
 from ..models.invoice import InvoiceUpdate
@@ -70,10 +71,7 @@ def _extract_spreadsheet_id(data_path: str) -> str:
 
 def _get_drive_context(db, invoice: dict) -> tuple:
     """Return (folder_id, project_data_path) for Drive file placement."""
-    folder_row = db.execute(
-        "SELECT value FROM company_settings WHERE key = 'invoice_drive_folder_id'"
-    ).fetchone()
-    folder_id = folder_row["value"] if folder_row else ""
+    folder_id = get_settings(db, "invoice_drive_folder_id").get("invoice_drive_folder_id") or ""
     project_row = db.execute(
         "SELECT data_path FROM projects WHERE id = %s", (invoice["project_id"],)
     ).fetchone()
@@ -120,7 +118,7 @@ def export_invoice_pdf(invoice_id: str, db=Depends(get_db)):
 @router.post("/{invoice_id}/finalize")
 def finalize_invoice(invoice_id: str, db=Depends(get_db)):
     """Finalize an invoice: read amounts from Google Sheet, snapshot to DB, generate PDF."""
-    from ..google_sheets import export_sheet_as_pdf, read_invoice_sheet, upload_pdf_to_drive
+    from ..google_sheets import export_sheet_as_pdf, google_executor, read_invoice_sheet, upload_pdf_to_drive
 
     invoice = db.execute(
         "SELECT * FROM invoices WHERE id = %s AND deleted_at IS NULL", (invoice_id,)
@@ -134,6 +132,10 @@ def finalize_invoice(invoice_id: str, db=Depends(get_db)):
 
     spreadsheet_id = _extract_spreadsheet_id(invoice["data_path"])
 
+    # The PDF export only needs the sheet and is the slowest call, so start it
+    # now and let it overlap with reading and storing the amounts (steps 1-3).
+    pdf_future = google_executor().submit(export_sheet_as_pdf, spreadsheet_id)
+
     # 1. Read current task amounts from Google Sheet
     sheet_tasks = read_invoice_sheet(spreadsheet_id)
 
@@ -165,7 +167,7 @@ def finalize_invoice(invoice_id: str, db=Depends(get_db)):
     )
 
     # 4. Export Google Sheet as PDF
-    pdf_bytes = export_sheet_as_pdf(spreadsheet_id)
+    pdf_bytes = pdf_future.result()
 
     # 5. Upload PDF to Google Drive (in project subfolder)
     folder_id, project_data_path = _get_drive_context(db, invoice)
@@ -211,17 +213,9 @@ def send_invoice(invoice_id: str, db=Depends(get_db)):
     project = dict(project)
 
     # Get company info
-    company_name = ""
-    company_email = ""
-    for key in ("company_name", "company_email"):
-        row = db.execute(
-            "SELECT value FROM company_settings WHERE key = %s", (key,)
-        ).fetchone()
-        if row:
-            if key == "company_name":
-                company_name = row["value"]
-            else:
-                company_email = row["value"]
+    company = get_settings(db, "company_name", "company_email")
+    company_name = company.get("company_name") or ""
+    company_email = company.get("company_email") or ""
 
     # 1. Export PDF and upload to Google Drive
     spreadsheet_id = _extract_spreadsheet_id(invoice["data_path"])
@@ -311,20 +305,10 @@ def generate_sheet_for_invoice(invoice_id: str, force: bool = False, db=Depends(
     p_dict = dict(project)
 
     # Get company settings
-    company_email = ""
-    drive_folder_id = ""
-    template_id = ""
-    for key in ("company_email", "invoice_drive_folder_id", "invoice_template_id"):
-        row = db.execute(
-            "SELECT value FROM company_settings WHERE key = %s", (key,)
-        ).fetchone()
-        if row and row["value"]:
-            if key == "company_email":
-                company_email = row["value"]
-            elif key == "invoice_drive_folder_id":
-                drive_folder_id = row["value"]
-            elif key == "invoice_template_id":
-                template_id = row["value"]
+    company = get_settings(db, "company_email", "invoice_drive_folder_id", "invoice_template_id")
+    company_email = company.get("company_email") or ""
+    drive_folder_id = company.get("invoice_drive_folder_id") or ""
+    template_id = company.get("invoice_template_id") or ""
 
     pm_email = p_dict.get("pm_email") or company_email
     client_display = p_dict.get("client_name") or ""
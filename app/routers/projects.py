@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from ..database import get_db
 from ..events import event_bus
+from ..read_cache import read_cache
 from ..models.project import ProjectContactAdd, ProjectContactResponse, ProjectCreate, ProjectDetail, ProjectNoteCreate, ProjectNoteResponse, ProjectSummary, ProjectUpdate
 from ..utils import generate_id, next_invoice_number, next_project_number
 from .deliverables import auto_create_deliverables
@@ -12,7 +13,7 @@ router = APIRouter()
 
 
 def _get_contracts_for_project(db, project_id: str) -> list[dict]:
-    from .contracts import _compute_task_billing
+    from .contracts import _get_tasks_with_billing
 
     contracts = []
     rows = db.execute(
@@ -21,11 +22,7 @@ def _get_contracts_for_project(db, project_id: str) -> list[dict]:
     ).fetchall()
     for c in rows:
         contract = dict(c)
-        tasks = db.execute(
-            "SELECT * FROM contract_tasks WHERE contract_id = %s ORDER BY sort_order",
-            (c["id"],),
-        ).fetchall()
-        contract["tasks"] = _compute_task_billing(db, c["id"], [dict(t) for t in tasks])
+        contract["tasks"] = _get_tasks_with_billing(db, c["id"])
         contracts.append(contract)
     return contracts
 
@@ -423,6 +420,7 @@ def create_project(data: ProjectCreate, db=Depends(get_db)):
             auto_create_deliverables(db, project_id, contract_id, now)
 
     db.commit()
+    read_cache.invalidate("clients")
     return get_project(project_id, db)
 
 
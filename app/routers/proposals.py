@@ -2,12 +2,14 @@ import logging
 from datetime import datetime
 from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from ..config import settings
 from ..database import get_db
 from ..engineers import CHANGES_TASK, ENGINEERS, RATES, load_default_tasks
 from ..events import event_bus
+from ..read_cache import read_cache
 from ..models.proposal import (
     ProposalCreate,
     ProposalGenerate,
@@ -188,6 +190,7 @@ def generate_proposal(data: ProposalGenerate, db=Depends(get_db)):
         )
 
     db.commit()
+    read_cache.invalidate("clients", "contacts")
     event_bus.publish(project_id, "proposal_updated", proposal_id)
 
     # --- Optionally generate Google Doc ---
@@ -483,13 +486,6 @@ def download_pdf(proposal_id: str, db=Depends(get_db)):
     if not doc_id:
         raise HTTPException(status_code=400, detail="Could not parse Google Doc ID from URL")
 
-    try:
-        from ..proposal_renderer import export_google_doc_as_pdf
-
-        pdf_bytes = export_google_doc_as_pdf(doc_id)
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=503, detail=str(e))
-
     project = db.execute(
         "SELECT name FROM projects WHERE id = %s AND deleted_at IS NULL", (proposal["project_id"],)
     ).fetchone()
@@ -497,8 +493,16 @@ def download_pdf(proposal_id: str, db=Depends(get_db)):
     ascii_filename = pdf_filename.encode("ascii", "ignore").decode("ascii") or "Proposal.pdf"
     encoded_filename = quote(pdf_filename)
 
-    return Response(
-        content=pdf_bytes,
+    try:
+        from ..proposal_renderer import stream_google_doc_pdf
+
+        pdf_chunks = stream_google_doc_pdf(doc_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    # Relay the PDF as Google sends it instead of buffering the whole file
+    return StreamingResponse(
+        pdf_chunks,
         media_type="application/pdf",
         headers={
             "Content-Disposition": (
@@ -94,11 +94,10 @@ def _build_task_response(db, task_row) -> dict:
 
 def _set_assignees(db, task_id: str, assignee_ids: list[str]):
     db.execute("DELETE FROM project_task_assignees WHERE task_id = %s", (task_id,))
-    for emp_id in assignee_ids:
-        db.execute(
-            "INSERT INTO project_task_assignees (task_id, employee_id) VALUES (%s, %s)",
-            (task_id, emp_id),
-        )
+    db.execute_batch(
+        "INSERT INTO project_task_assignees (task_id, employee_id) VALUES %s",
+        [(task_id, emp_id) for emp_id in assignee_ids],
+    )
 
 
 # --- Project-scoped endpoints ---
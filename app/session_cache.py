@@ -0,0 +1,54 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+# How long a validated session is trusted without re-checking Postgres.
+# Short enough that deactivations and profile edits made elsewhere show up
+# quickly; the writers we control invalidate explicitly.
+SESSION_CACHE_TTL = 300  # 5 minutes
+
+
+class SessionCache:
+    """In-process cache of session token -> employee row.
+
+    Lets get_current_employee skip the sessions/employees JOIN (and the
+    sliding-expiry write) for tokens it has validated recently. Each entry
+    keeps the session's expires_at, so a hit is still refused once the
+    session itself has expired, however recently it was cached.
+    """
+
+    def __init__(self, ttl: float = SESSION_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._entries: dict[str, tuple[dict, float, datetime]] = {}
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            employee, cached_at, expires_at = entry
+            if (
+                time.monotonic() - cached_at > self._ttl
+                or expires_at <= datetime.now(timezone.utc)
+            ):
+                del self._entries[token]
+                return None
+            return dict(employee)
+
+    def put(self, token: str, employee: dict, expires_at: datetime):
+        with self._lock:
+            self._entries[token] = (dict(employee), time.monotonic(), expires_at)
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_employee(self, employee_id: str):
+        with self._lock:
+            self._entries = {
+                t: e for t, e in self._entries.items() if e[0].get("id") != employee_id
+            }
+
+
+session_cache = SessionCache()
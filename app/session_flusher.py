@@ -0,0 +1,67 @@
+"""Batched sliding-expiry writes for session tokens.
+
+Extending a session on every authenticated request used to cost an UPDATE
+and a commit on the request path. Instead, get_current_employee records the
+token here and a daemon thread pushes all pending extensions to Postgres in
+one statement every few seconds. Expiry only needs to be approximately
+fresh, so losing a few seconds of extensions on a crash is harmless.
+"""
+
+import logging
+import threading
+
+from .database import lease_connection
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5  # seconds
+
+
+class SessionExtender:
+    def __init__(self, days: int, interval: float = FLUSH_INTERVAL):
+        self._days = days
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, token: str):
+        with self._lock:
+            self._pending.add(token)
+
+    def flush(self):
+        with self._lock:
+            tokens, self._pending = list(self._pending), set()
+        if not tokens:
+            return
+        try:
+            with lease_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "UPDATE sessions SET expires_at = NOW() + make_interval(days => %s) "
+                        "WHERE token = ANY(%s)",
+                        (self._days, tokens),
+                    )
+                conn.commit()
+        except Exception:
+            logger.warning("Failed to extend %d session(s)", len(tokens), exc_info=True)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-extender", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write out anything still pending."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self._interval + 1)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.flush()
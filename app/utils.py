@@ -44,3 +44,14 @@ def next_invoice_number(db, project_id: str) -> str:
         if len(parts) > 1 and parts[-1].isdigit():
             max_num = max(max_num, int(parts[-1]))
     return f"{prefix}-{max_num + 1}"
+
+
+def refresh_note_authors(db, employee_id: str):
+    """Rewrite the denormalized author name/avatar on an employee's client and contact notes."""
+    for table in ("client_notes", "contact_notes"):
+        db.execute(
+            f"UPDATE {table} n SET author_name = e.first_name || ' ' || e.last_name, "
+            "author_avatar_url = e.avatar_url "
+            "FROM employees e WHERE e.id = %s AND n.author_id = e.id",
+            (employee_id,),
+        )
@@ -0,0 +1,6 @@
+-- Full-text index for client search (GET /api/clients?q=...)
+-- Expression index rather than a stored column so SELECT * stays unchanged;
+-- the router must use the exact same expression for the planner to match it.
+
+CREATE INDEX IF NOT EXISTS idx_clients_search ON clients
+    USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(accounting_email, '')));
@@ -0,0 +1,7 @@
+-- Trigram indexes so the substring fallback in client search
+-- (name/accounting_email ILIKE '%q%') can use an index instead of a seq scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_clients_name_trgm ON clients USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clients_accounting_email_trgm ON clients USING gin (accounting_email gin_trgm_ops);
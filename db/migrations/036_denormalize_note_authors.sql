@@ -0,0 +1,22 @@
+-- Store the author's display name and avatar on client/contact notes so
+-- note lists don't JOIN employees on every read. Written at INSERT time and
+-- refreshed by the app when an employee's name or avatar changes
+-- (utils.refresh_note_authors).
+
+ALTER TABLE client_notes
+    ADD COLUMN IF NOT EXISTS author_name TEXT,
+    ADD COLUMN IF NOT EXISTS author_avatar_url TEXT;
+
+ALTER TABLE contact_notes
+    ADD COLUMN IF NOT EXISTS author_name TEXT,
+    ADD COLUMN IF NOT EXISTS author_avatar_url TEXT;
+
+UPDATE client_notes n
+SET author_name = e.first_name || ' ' || e.last_name, author_avatar_url = e.avatar_url
+FROM employees e
+WHERE n.author_id = e.id;
+
+UPDATE contact_notes n
+SET author_name = e.first_name || ' ' || e.last_name, author_avatar_url = e.avatar_url
+FROM employees e
+WHERE n.author_id = e.id;
@@ -0,0 +1,17 @@
+-- Indexes matching the ORDER BY + keyset cursor of the client/contact and
+-- note list endpoints, so each page is a walk of a pre-sorted index instead
+-- of a scan followed by a sort. Partial on deleted_at IS NULL like the
+-- queries themselves.
+
+CREATE INDEX IF NOT EXISTS idx_clients_active_name ON clients(name, id) WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_contacts_active_name ON contacts(name, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_contacts_active_client_name ON contacts(client_id, name, id) WHERE deleted_at IS NULL;
+
+-- Notes are listed newest first per parent; these replace the plain
+-- parent-id indexes from migration 018, which they cover as a prefix.
+CREATE INDEX IF NOT EXISTS idx_client_notes_client_created ON client_notes(client_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_client_notes_client;
+
+CREATE INDEX IF NOT EXISTS idx_contact_notes_contact_created ON contact_notes(contact_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_contact_notes_contact;
@@ -0,0 +1,21 @@
+-- Indexes for the contract billing queries: the per-task billed totals
+-- (line items of a contract's active invoices, grouped by name) and the
+-- "latest invoice for this contract" lookup in invoice creation.
+-- Plain CREATE INDEX like the other migrations; these tables are small.
+
+CREATE INDEX IF NOT EXISTS idx_invoices_contract_active ON invoices(contract_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Covers the SUM(amount) ... GROUP BY name aggregate without heap reads.
+-- Replaces the invoice_id-only index, which it covers as a prefix.
+CREATE INDEX IF NOT EXISTS idx_invoice_items_invoice_name ON invoice_line_items(invoice_id, name) INCLUDE (amount);
+DROP INDEX IF EXISTS idx_invoice_items_invoice;
+
+-- Backs ORDER BY sort_order when loading a contract's tasks; replaces the
+-- contract_id-only index.
+CREATE INDEX IF NOT EXISTS idx_contract_tasks_contract_order ON contract_tasks(contract_id, sort_order);
+DROP INDEX IF EXISTS idx_contract_tasks_contract;
+
+-- list_employees orders active employees by name.
+CREATE INDEX IF NOT EXISTS idx_employees_active_name ON employees(first_name, last_name)
+    WHERE deleted_at IS NULL;
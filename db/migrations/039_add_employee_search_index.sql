@@ -0,0 +1,9 @@
+-- Trigram index so employee search (ILIKE '%q%' over name and email) can use
+-- an index instead of a seq scan. The expression must match _EMPLOYEE_SEARCH
+-- in app/routers/employees.py.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_employees_search_trgm ON employees USING gin (
+    (coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')) gin_trgm_ops
+) WHERE deleted_at IS NULL;
@@ -7,6 +7,9 @@
 --   - Foreign keys: singular_table_id
 --   - Timestamps: created_at, updated_at, deleted_at (soft delete)
 
+-- Trigram indexes back substring (ILIKE '%q%') search on clients and employees
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================================================
 -- CLIENTS
 -- Companies or individuals we do business with
@@ -25,6 +28,13 @@ CREATE TABLE clients (
 
 CREATE INDEX idx_clients_accounting_email ON clients(accounting_email);
 CREATE INDEX idx_clients_name ON clients(name);
+CREATE INDEX idx_clients_active_name ON clients(name, id) WHERE deleted_at IS NULL;
+-- Client search (GET /api/clients?q=...); the expression must match
+-- _CLIENT_TSV in app/routers/clients.py
+CREATE INDEX idx_clients_search ON clients
+    USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(accounting_email, '')));
+CREATE INDEX idx_clients_name_trgm ON clients USING gin (name gin_trgm_ops);
+CREATE INDEX idx_clients_accounting_email_trgm ON clients USING gin (accounting_email gin_trgm_ops);
 
 -- ============================================================================
 -- CONTACTS
@@ -38,6 +48,7 @@ CREATE TABLE contacts (
     phone TEXT,
     role TEXT,                              -- e.g., 'Project Manager', 'Engineer'
     client_id TEXT REFERENCES clients(id),  -- optional link to parent client
+    notes TEXT,                             -- markdown (migration 019)
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     deleted_at TIMESTAMPTZ
@@ -45,6 +56,8 @@ CREATE TABLE contacts (
 
 CREATE INDEX idx_contacts_client ON contacts(client_id);
 CREATE INDEX idx_contacts_email ON contacts(email);
+CREATE INDEX idx_contacts_active_name ON contacts(name, id) WHERE deleted_at IS NULL;
+CREATE INDEX idx_contacts_active_client_name ON contacts(client_id, name, id) WHERE deleted_at IS NULL;
 
 -- ============================================================================
 -- PROJECTS
@@ -122,7 +135,7 @@ CREATE TABLE contract_tasks (
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_contract_tasks_contract ON contract_tasks(contract_id);
+CREATE INDEX idx_contract_tasks_contract_order ON contract_tasks(contract_id, sort_order);
 
 -- ============================================================================
 -- PROPOSALS
@@ -198,6 +211,8 @@ CREATE UNIQUE INDEX idx_invoices_number ON invoices(invoice_number) WHERE delete
 CREATE INDEX idx_invoices_project ON invoices(project_id);
 CREATE INDEX idx_invoices_status ON invoices(sent_status, paid_status);
 CREATE INDEX idx_invoices_previous ON invoices(previous_invoice_id);
+CREATE INDEX idx_invoices_contract_active ON invoices(contract_id, created_at DESC)
+    WHERE deleted_at IS NULL;
 
 -- ============================================================================
 -- INVOICE_LINE_ITEMS
@@ -219,7 +234,8 @@ CREATE TABLE invoice_line_items (
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_invoice_items_invoice ON invoice_line_items(invoice_id);
+-- INCLUDE (amount) covers the per-task billed totals without heap reads
+CREATE INDEX idx_invoice_items_invoice_name ON invoice_line_items(invoice_id, name) INCLUDE (amount);
 
 -- ============================================================================
 -- EMPLOYEES
@@ -239,6 +255,14 @@ CREATE TABLE employees (
     deleted_at TIMESTAMPTZ
 );
 
+CREATE INDEX idx_employees_active_name ON employees(first_name, last_name)
+    WHERE deleted_at IS NULL;
+-- Employee search; the expression must match _EMPLOYEE_SEARCH in
+-- app/routers/employees.py
+CREATE INDEX idx_employees_search_trgm ON employees USING gin (
+    (coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')) gin_trgm_ops
+) WHERE deleted_at IS NULL;
+
 -- ============================================================================
 -- SESSIONS
 -- Server-side session tokens for employee authentication
@@ -346,20 +370,24 @@ CREATE TABLE client_notes (
     client_id TEXT NOT NULL REFERENCES clients(id) ON DELETE CASCADE,
     author_id TEXT REFERENCES employees(id),
     content TEXT NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    author_name TEXT,                       -- copied from employees on write
+    author_avatar_url TEXT
 );
 
-CREATE INDEX idx_client_notes_client ON client_notes(client_id);
+CREATE INDEX idx_client_notes_client_created ON client_notes(client_id, created_at DESC, id DESC);
 
 CREATE TABLE contact_notes (
     id TEXT PRIMARY KEY,
     contact_id TEXT NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
     author_id TEXT REFERENCES employees(id),
     content TEXT NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    author_name TEXT,                       -- copied from employees on write
+    author_avatar_url TEXT
 );
 
-CREATE INDEX idx_contact_notes_contact ON contact_notes(contact_id);
+CREATE INDEX idx_contact_notes_contact_created ON contact_notes(contact_id, created_at DESC, id DESC);
 -- ============================================================================
 -- TIME ENTRIES
 -- Hours logged against projects for visibility/management
@@ -21,7 +21,8 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.database import get_db, PgConnection
+from app.database import get_db, PgConnection, _PooledConnection
+from app.read_cache import read_cache
 
 
 # Path to the SQL schema file
@@ -36,7 +37,13 @@ TEST_DATABASE_URL = os.environ.get(
 
 def _create_test_db() -> PgConnection:
     """Create a fresh test database connection with the full Conductor schema."""
-    conn = psycopg2.connect(TEST_DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
+    # Same connection class as the app's pool, so execute_prepared() really
+    # PREPAREs instead of falling back to a plain execute
+    conn = psycopg2.connect(
+        TEST_DATABASE_URL,
+        connection_factory=_PooledConnection,
+        cursor_factory=psycopg2.extras.RealDictCursor,
+    )
     conn.autocommit = True
     cur = conn.cursor()
 
@@ -72,6 +79,8 @@ def client():
     - After the test, we undo the override and close the DB
     """
     db = _create_test_db()
+    # Cached GET responses belong to the previous test's database
+    read_cache.invalidate("clients", "contacts", "company")
 
     def _override_get_db():
         try:
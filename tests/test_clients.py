@@ -0,0 +1,61 @@
+"""
+Tests for GET /api/clients: keyset pagination and search.
+
+Run with:  pytest tests/test_clients.py -v
+"""
+
+from app.pagination import NEXT_CURSOR_HEADER
+
+
+def _seed_clients(db, *names):
+    db.execute_batch(
+        "INSERT INTO clients (id, name) VALUES %s",
+        [(f"c-{i}", name) for i, name in enumerate(names)],
+    )
+    db.commit()
+
+
+def test_keyset_pagination_walks_all_pages(client, db):
+    names = ["Acme", "Birch", "Cedar", "Dune", "Elm"]
+    _seed_clients(db, *reversed(names))
+
+    seen = []
+    params = {"limit": 2}
+    pages = 0
+    while True:
+        resp = client.get("/api/clients", params=params)
+        assert resp.status_code == 200
+        seen += [c["name"] for c in resp.json()]
+        pages += 1
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params = {"limit": 2, "after": cursor}
+
+    assert seen == names
+    assert pages == 3
+
+
+def test_without_limit_returns_everything_and_no_cursor(client, db):
+    _seed_clients(db, "Acme", "Birch", "Cedar")
+    resp = client.get("/api/clients")
+    assert [c["name"] for c in resp.json()] == ["Acme", "Birch", "Cedar"]
+    assert NEXT_CURSOR_HEADER not in resp.headers
+
+
+def test_bad_cursor_is_400(client, db):
+    assert client.get("/api/clients", params={"after": "garbage"}).status_code == 400
+
+
+def test_search_includes_substring_matches(client, db):
+    _seed_clients(db, "Johnson Farms", "Sonic Builders", "Acme")
+    resp = client.get("/api/clients", params={"q": "son"})
+    assert resp.status_code == 200
+    names = [c["name"] for c in resp.json()]
+    # The word-prefix hit ranks first; the mid-word match is still included
+    assert names == ["Sonic Builders", "Johnson Farms"]
+
+
+def test_search_with_paging_params_is_400(client, db):
+    assert client.get("/api/clients", params={"q": "acme", "limit": 10}).status_code == 400
+    assert client.get("/api/clients", params={"q": "acme", "after": "x"}).status_code == 400
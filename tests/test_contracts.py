@@ -0,0 +1,124 @@
+"""
+Tests for the contract endpoints: single-statement writes with RETURNING and
+invoice creation through the writable CTE.
+
+Run with:  pytest tests/test_contracts.py -v
+"""
+
+
+def _seed_project(db, project_id="TEST01"):
+    db.execute("INSERT INTO clients (id, name) VALUES ('c-test1', 'Test Client')")
+    db.execute(
+        "INSERT INTO projects (id, name, client_id, job_code) VALUES (%s, 'Test Project', 'c-test1', 'TST')",
+        (project_id,),
+    )
+    db.commit()
+
+
+def _create_contract(client, project_id="TEST01"):
+    resp = client.post("/api/contracts", json={
+        "project_id": project_id,
+        "tasks": [
+            {"name": "Design", "amount": 1000},
+            {"name": "Construction Admin", "amount": 500},
+        ],
+    })
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def test_create_contract_returns_inserted_rows(client, db):
+    _seed_project(db)
+    contract = _create_contract(client)
+
+    assert float(contract["total_amount"]) == 1500
+    assert [t["name"] for t in contract["tasks"]] == ["Design", "Construction Admin"]
+    assert [t["sort_order"] for t in contract["tasks"]] == [1, 2]
+    assert all(t["billed_amount"] == 0 for t in contract["tasks"])
+
+    fetched = client.get(f"/api/contracts/{contract['id']}").json()
+    assert [t["id"] for t in fetched["tasks"]] == [t["id"] for t in contract["tasks"]]
+
+
+def test_create_contract_for_missing_project_is_404(client, db):
+    resp = client.post("/api/contracts", json={"project_id": "NOPE"})
+    assert resp.status_code == 404
+
+
+def test_task_update_and_delete_recompute_total(client, db):
+    _seed_project(db)
+    contract = _create_contract(client)
+    design, admin = contract["tasks"]
+
+    resp = client.patch(f"/api/contracts/{contract['id']}/tasks/{design['id']}", json={"amount": 2000})
+    assert resp.status_code == 200
+    assert float(resp.json()["total_amount"]) == 2500
+
+    resp = client.delete(f"/api/contracts/{contract['id']}/tasks/{admin['id']}")
+    assert resp.status_code == 200
+    assert float(client.get(f"/api/contracts/{contract['id']}").json()["total_amount"]) == 2000
+
+    # Missing task: the UPDATE/DELETE ... RETURNING finds no row
+    assert client.patch(f"/api/contracts/{contract['id']}/tasks/ctask-nope", json={"amount": 1}).status_code == 404
+    assert client.delete(f"/api/contracts/{contract['id']}/tasks/ctask-nope").status_code == 404
+
+
+def test_delete_contract(client, db):
+    _seed_project(db)
+    contract = _create_contract(client)
+
+    assert client.delete(f"/api/contracts/{contract['id']}").status_code == 200
+    assert client.get(f"/api/contracts/{contract['id']}").status_code == 404
+    assert client.delete(f"/api/contracts/{contract['id']}").status_code == 404
+
+
+def test_invoices_from_contract_are_chained(client, db):
+    _seed_project(db)
+    contract = _create_contract(client)
+    design, admin = contract["tasks"]
+    url = f"/api/contracts/{contract['id']}/invoices"
+
+    first = client.post(url, json={
+        "tasks": [{"task_id": design["id"], "percent_this_invoice": 50}],
+        "invoice_date": "2026-10-01",
+    })
+    assert first.status_code == 200, first.text
+    first = first.json()
+    assert first["invoice_number"] == "TST-1"
+    assert first["previous_invoice_id"] is None
+    assert first["invoice_date"] == "2026-10-01"
+    assert float(first["total_due"]) == 500
+
+    second = client.post(url, json={
+        "tasks": [
+            {"task_id": design["id"], "percent_this_invoice": 25},
+            {"task_id": admin["id"], "amount_this_invoice": 100},
+        ],
+    }).json()
+    assert second["invoice_number"] == "TST-2"
+    assert second["previous_invoice_id"] == first["id"]
+    assert float(second["total_due"]) == 350
+
+    # The CTE's UPDATE made the new invoice the project's current one
+    current = db.execute("SELECT current_invoice_id FROM projects WHERE id = 'TEST01'").fetchone()
+    assert current["current_invoice_id"] == second["id"]
+
+    items = db.execute(
+        "SELECT name, amount, previous_billing FROM invoice_line_items "
+        "WHERE invoice_id = %s ORDER BY sort_order",
+        (second["id"],),
+    ).fetchall()
+    assert [(i["name"], float(i["amount"]), float(i["previous_billing"])) for i in items] == [
+        ("Design", 250, 500),
+        ("Construction Admin", 100, 0),
+    ]
+
+
+def test_invoice_from_unknown_task_is_404(client, db):
+    _seed_project(db)
+    contract = _create_contract(client)
+    resp = client.post(
+        f"/api/contracts/{contract['id']}/invoices",
+        json={"tasks": [{"task_id": "ctask-nope", "percent_this_invoice": 10}]},
+    )
+    assert resp.status_code == 404
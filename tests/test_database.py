@@ -0,0 +1,46 @@
+"""
+Tests for the PgConnection helpers: execute_prepared and execute_batch.
+
+Run with:  pytest tests/test_database.py -v
+"""
+
+
+def _prepared_names(db):
+    return {r["name"] for r in db.execute("SELECT name FROM pg_prepared_statements").fetchall()}
+
+
+def test_execute_prepared_prepares_once_and_reuses(db):
+    sql = "SELECT %s::int + %s::int AS total"
+
+    row = db.execute_prepared("test_add", sql, (1, 2)).fetchone()
+    assert row["total"] == 3
+    assert "test_add" in _prepared_names(db)
+
+    # Second call only EXECUTEs; a second PREPARE of the same name would error
+    row = db.execute_prepared("test_add", sql, (40, 2)).fetchone()
+    assert row["total"] == 42
+
+
+def test_execute_prepared_tuples(db):
+    row = db.execute_prepared(
+        "test_pair", "SELECT %s::text AS a, %s::int AS b", ("x", 7), tuples=True
+    ).fetchone()
+    assert row == ("x", 7)
+
+
+def test_execute_batch_fetch_returns_inserted_rows(db):
+    rows = db.execute_batch(
+        "INSERT INTO clients (id, name) VALUES %s RETURNING id, name",
+        [("c-b1", "Alpha"), ("c-b2", "Beta"), ("c-b3", "Gamma")],
+        page_size=2,  # spans two pages; rows from both must come back
+        fetch=True,
+    )
+    assert sorted((r["id"], r["name"]) for r in rows) == [
+        ("c-b1", "Alpha"), ("c-b2", "Beta"), ("c-b3", "Gamma"),
+    ]
+    count = db.execute("SELECT COUNT(*) AS n FROM clients").fetchone()["n"]
+    assert count == 3
+
+
+def test_execute_batch_empty_rows_is_noop(db):
+    assert db.execute_batch("INSERT INTO clients (id, name) VALUES %s", [], fetch=True) == []
@@ -0,0 +1,83 @@
+"""
+Tests for the requests create_invoice_sheet sends, against mocked Google
+services (no credentials or network needed).
+
+Run with:  pytest tests/test_invoice_sheet.py -v
+"""
+
+from unittest.mock import MagicMock, patch
+
+from app import google_sheets
+
+LAYOUT = {
+    "sheet_id": 7,
+    "sheet_title": "Invoice",
+    "marker_row": 10,
+    "token_cells": [
+        (2, 1, "[InvoiceDate]"),
+        (3, 1, "Rendered Through: [Date]"),
+        (20, 5, "[InvoiceTotal]"),
+    ],
+}
+
+TASKS = [
+    {"name": "Design", "unit_price": 1000, "quantity": 50, "previous_billing": 0, "amount": 500},
+    {"name": "Construction Admin", "unit_price": 500, "quantity": 59.99999, "previous_billing": 100, "amount": 200},
+]
+
+
+def _create_sheet():
+    drive, sheets = MagicMock(), MagicMock()
+    drive.files.return_value.copy.return_value.execute.return_value = {"id": "sheet-1"}
+    with patch.object(google_sheets, "get_drive_service", return_value=drive), \
+            patch.object(google_sheets, "get_sheets_service", return_value=sheets), \
+            patch.object(google_sheets, "_template_layout", return_value=LAYOUT):
+        url = google_sheets.create_invoice_sheet(
+            invoice_number="TST-1",
+            project_name="Test Project",
+            project_id="TEST01",
+            invoice_date="2026-10-16",
+            company_email="pm@example.com",
+            client_name="Test Client",
+            tasks=TASKS,
+            folder_id="folder-1",
+            template_id="template-1",
+        )
+    return url, drive, sheets
+
+
+def test_structure_and_values_go_in_separate_requests():
+    url, drive, sheets = _create_sheet()
+    assert url == "https://docs.google.com/spreadsheets/d/sheet-1/edit"
+    assert drive.files.return_value.copy.call_args.kwargs["body"]["parents"] == ["folder-1"]
+
+    requests = sheets.spreadsheets.return_value.batchUpdate.call_args.kwargs["body"]["requests"]
+    # Only row insertion and formatting: values must not be written as typed
+    # updateCells, which would store dates as plain strings
+    assert [next(iter(r)) for r in requests] == ["insertDimension", "repeatCell", "repeatCell"]
+    assert requests[0]["insertDimension"]["range"] == {
+        "sheetId": 7, "dimension": "ROWS", "startIndex": 11, "endIndex": 12,
+    }
+    aligned = [
+        (r["repeatCell"]["range"]["startRowIndex"], r["repeatCell"]["range"]["startColumnIndex"])
+        for r in requests[1:]
+    ]
+    assert aligned == [(2, 1), (3, 1)]
+
+
+def test_values_are_user_entered():
+    _, _, sheets = _create_sheet()
+    body = sheets.spreadsheets.return_value.values.return_value.batchUpdate.call_args.kwargs["body"]
+    assert body["valueInputOption"] == "USER_ENTERED"
+
+    values = {d["range"]: d["values"][0][0] for d in body["data"]}
+    # Dates go in as typed text so Sheets parses them into real dates
+    assert values["Invoice!B3"] == "2026-10-16"
+    assert values["Invoice!B4"] == "Rendered Through: 2026-10-16"
+    # Below the marker row, shifted down by the one inserted row
+    assert values["Invoice!F22"] == "700.0"
+    assert values["Invoice!A11"] == "Design"
+    assert values["Invoice!D11"] == "50%"
+    assert values["Invoice!A12"] == "Construction Admin"
+    assert values["Invoice!D12"] == "60%"
+    assert values["Invoice!E12"] == 100
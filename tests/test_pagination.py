@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor(ts, "note-1")) == [ts.isoformat(), "note-1"]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor("only-one")])
+def test_bad_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_paginate_sets_header_only_when_more_rows():
+    response = Response()
+    rows = [{"name": n, "id": i} for i, n in enumerate("abc")]
+    page = paginate(response, rows, 2, lambda r: (r["name"], r["id"]))
+    assert [r["name"] for r in page] == ["a", "b"]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == ["b", 1]
+
+    response = Response()
+    assert paginate(response, rows, 3, lambda r: (r["name"], r["id"])) == rows
+    assert NEXT_CURSOR_HEADER not in response.headers
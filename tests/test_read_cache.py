@@ -0,0 +1,37 @@
+from app.read_cache import ReadCache
+
+
+def test_hit_and_miss():
+    cache = ReadCache()
+    assert cache.get("clients", "list") is None
+    cache.put("clients", "list", value=[{"id": "c-1"}], generation=cache.generation("clients"))
+    assert cache.get("clients", "list") == [{"id": "c-1"}]
+    assert cache.get("clients", "notes", "c-1") is None
+
+
+def test_expired_entry_is_a_miss():
+    cache = ReadCache(ttl=-1)
+    cache.put("company", value={"name": "Acme"}, generation=cache.generation("company"))
+    assert cache.get("company") is None
+
+
+def test_invalidate_drops_only_that_namespace():
+    cache = ReadCache()
+    cache.put("clients", "list", value=[], generation=0)
+    cache.put("clients", "notes", "c-1", value=[], generation=0)
+    cache.put("contacts", "list", None, value=[], generation=0)
+    cache.invalidate("clients")
+    assert cache.get("clients", "list") is None
+    assert cache.get("clients", "notes", "c-1") is None
+    assert cache.get("contacts", "list", None) == []
+
+
+def test_put_after_concurrent_invalidate_is_dropped():
+    cache = ReadCache()
+    generation = cache.generation("clients")
+    # A write commits and invalidates while the read's query is in flight
+    cache.invalidate("clients")
+    cache.put("clients", "list", value=[{"id": "stale"}], generation=generation)
+    assert cache.get("clients", "list") is None
+    cache.put("clients", "list", value=[], generation=cache.generation("clients"))
+    assert cache.get("clients", "list") == []
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+
+from app.session_cache import SessionCache
+
+LATER = datetime.now(timezone.utc) + timedelta(days=30)
+
+
+def test_hit_returns_copy():
+    cache = SessionCache()
+    cache.put("tok", {"id": "emp-1", "first_name": "Tim"}, LATER)
+    got = cache.get("tok")
+    assert got == {"id": "emp-1", "first_name": "Tim"}
+    got["first_name"] = "mutated"
+    assert cache.get("tok")["first_name"] == "Tim"   # callers can't poison the cache
+
+
+def test_expired_entry_is_a_miss():
+    cache = SessionCache(ttl=-1)
+    cache.put("tok", {"id": "emp-1"}, LATER)
+    assert cache.get("tok") is None
+
+
+def test_invalidate_employee_drops_all_their_tokens():
+    cache = SessionCache()
+    cache.put("a", {"id": "emp-1"}, LATER)
+    cache.put("b", {"id": "emp-1"}, LATER)
+    cache.put("c", {"id": "emp-2"}, LATER)
+    cache.invalidate_employee("emp-1")
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == {"id": "emp-2"}
+
+
+def test_expired_session_is_a_miss():
+    cache = SessionCache()
+    cache.put("tok", {"id": "emp-1"}, datetime.now(timezone.utc) - timedelta(seconds=1))
+    assert cache.get("tok") is None
@@ -0,0 +1,74 @@
+"""
+Tests for session lookup (prepared statement + in-process cache) and the
+batched sliding-expiry writes.
+
+Run with:  pytest tests/test_sessions.py -v
+"""
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from app.auth import SESSION_COOKIE, session_extender
+from app.session_cache import session_cache
+
+
+def _signup(client, email="pat@example.com"):
+    resp = client.post("/api/auth/signup", json={"email": email, "password": "secret123"})
+    assert resp.status_code == 200, resp.text
+    return client.cookies.get(SESSION_COOKIE)
+
+
+def test_session_lookup_and_cache(client, db):
+    token = _signup(client)
+
+    resp = client.get("/api/auth/me")
+    assert resp.status_code == 200
+    assert resp.json()["email"] == "pat@example.com"
+
+    # Served from the cache: the sessions row is no longer consulted
+    db.execute("DELETE FROM sessions WHERE token = %s", (token,))
+    db.commit()
+    assert client.get("/api/auth/me").status_code == 200
+
+    session_cache.invalidate_token(token)
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def test_expired_session_is_rejected(client, db):
+    token = _signup(client)
+    db.execute("UPDATE sessions SET expires_at = NOW() - interval '1 second' WHERE token = %s", (token,))
+    db.commit()
+    session_cache.invalidate_token(token)
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def test_deactivated_employee_is_rejected(client, db):
+    token = _signup(client)
+    db.execute("UPDATE employees SET is_active = FALSE")
+    db.commit()
+    session_cache.invalidate_token(token)
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def test_session_extension_is_queued_and_flushed(client, db):
+    # Keep the background thread from flushing against the real database
+    session_extender.stop()
+    token = _signup(client)
+    db.execute("UPDATE sessions SET expires_at = NOW() + interval '1 day' WHERE token = %s", (token,))
+    db.commit()
+    session_cache.invalidate_token(token)
+
+    assert client.get("/api/auth/me").status_code == 200
+
+    @contextmanager
+    def _test_connection():
+        yield db._conn
+
+    with patch("app.session_flusher.lease_connection", _test_connection):
+        session_extender.flush()
+
+    extended = db.execute(
+        "SELECT expires_at > NOW() + interval '29 days' AS extended FROM sessions WHERE token = %s",
+        (token,),
+    ).fetchone()["extended"]
+    assert extended